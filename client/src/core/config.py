@@ -1,97 +1,178 @@
 """Configuration and feature flags for the AI Gaming Assistant client."""
 
+import atexit
 import os
 import json
+import threading
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Optional, Sequence
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Default feature flags
+DEFAULT_FEATURES = MappingProxyType({
+    "use_tts": False,  # Text-to-speech disabled for phase 1
+    "use_overlay": True,  # Use transparent overlay for responses
+    "log_responses": True,  # Always log responses to console/file
+    "auto_show_overlay": True,  # Automatically show overlay on response
+    "screenshot_format": "jpeg",  # Screenshot upload encoding: "jpeg" or "png"
+    "audio_backend": "auto",  # TTS playback: "auto", "sounddevice", "pygame" or "pyaudio"
+})
+
+# Model configuration (model lists are immutable tuples shared by all instances)
+DEFAULT_MODELS = MappingProxyType({
+    "default_model": "gpt-5",  # Default model for analysis (OpenAI)
+    "available_claude_models": (
+        "claude-3.5-sonnet",
+        "claude-4-sonnet",
+        "claude-4-opus",
+        "claude-4-sonnet-thinking",
+        "claude-4-opus-thinking"
+    ),
+    "available_openai_models": (
+        # Curated Tier 1 set
+        "gpt-5",
+        "gpt-chat",        # Optional chat-optimized alias
+        "gpt-4o",
+        "gpt-4o-mini",
+        "o3"
+    )
+})
 
 
 class Config:
     """Configuration manager with feature flags."""
     
+    # Delay used to coalesce bursts of setter calls into a single write
+    SAVE_DEBOUNCE_SECONDS = 0.2
+    
     def __init__(self):
-        # Default feature flags
-        self.features = {
-            "use_tts": False,  # Text-to-speech disabled for phase 1
-            "use_overlay": True,  # Use transparent overlay for responses
-            "log_responses": True,  # Always log responses to console/file
-            "auto_show_overlay": True,  # Automatically show overlay on response
-        }
-        
-        # Model configuration
-        self.models = {
-            "default_model": "gpt-5",  # Default model for analysis (OpenAI)
-            "available_claude_models": [
-                "claude-3.5-sonnet",
-                "claude-4-sonnet",
-                "claude-4-opus",
-                "claude-4-sonnet-thinking",
-                "claude-4-opus-thinking"
-            ],
-            "available_openai_models": [
-                # Curated Tier 1 set
-                "gpt-5",
-                "gpt-chat",        # Optional chat-optimized alias
-                "gpt-4o",
-                "gpt-4o-mini",
-                "o3"
-            ]
-        }
+        # Start from the shared defaults; only the top-level dicts are copied
+        self.features = dict(DEFAULT_FEATURES)
+        self.models = dict(DEFAULT_MODELS)
         
-        # Load user config if exists
+        # User config is loaded lazily on first access to keep startup free of disk I/O
         self.config_path = Path.home() / ".ai_gaming_assistant" / "config.json"
-        self.load_config()
+        self._loaded = False
+        
+        # Debounced saving state
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.Lock()
+        # Serializes writes so the timer thread and the exit flush never
+        # interleave on the temporary file or swap in an older snapshot last
+        self._write_lock = threading.Lock()
+        atexit.register(self._flush)
+    
+    def _ensure_loaded(self):
+        """Load the user config on first use."""
+        if not self._loaded:
+            self.load_config()
     
     def load_config(self):
         """Load configuration from user's config file."""
+        self._loaded = True
         if self.config_path.exists():
             try:
-                with open(self.config_path, 'r') as f:
-                    user_config = json.load(f)
-                    # Update features with user preferences
-                    if "features" in user_config:
-                        self.features.update(user_config["features"])
-                    # Update models with user preferences
-                    if "models" in user_config:
-                        self.models.update(user_config["models"])
+                raw = self.config_path.read_bytes()
+                user_config = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+                # Update features with user preferences
+                if "features" in user_config:
+                    self.features.update(user_config["features"])
+                # Update models with user preferences
+                if "models" in user_config:
+                    self.models.update(user_config["models"])
             except Exception as e:
                 print(f"Warning: Could not load config: {e}")
     
     def save_config(self):
         """Save current configuration to file."""
-        self.config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.config_path, 'w') as f:
-            json.dump({
+        self._ensure_loaded()
+        with self._write_lock:
+            # Serialized under the lock, so the last write holds the latest state
+            data = {
                 "features": self.features,
                 "models": self.models
-            }, f, indent=2)
+            }
+            if ORJSON_AVAILABLE:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(data, indent=2).encode("utf-8")
+            
+            # Write to a temporary file and atomically swap it in, so a crash
+            # never leaves a truncated config behind
+            self.config_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.config_path.with_suffix(".json.tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, self.config_path)
+    
+    def _schedule_save(self):
+        """Mark the config dirty and (re)start the debounced save timer."""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.SAVE_DEBOUNCE_SECONDS, self._flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def _flush(self):
+        """Write pending changes to disk, if any."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+        try:
+            self.save_config()
+        except Exception as e:
+            print(f"Warning: Could not save config: {e}")
     
     def get_feature(self, feature_name: str, default: bool = False) -> bool:
         """Get a feature flag value."""
+        self._ensure_loaded()
         return self.features.get(feature_name, default)
     
+    def get_setting(self, name: str, default: Any = None) -> Any:
+        """Get a non-boolean setting (stored alongside the feature flags)."""
+        self._ensure_loaded()
+        return self.features.get(name, default)
+    
     def set_feature(self, feature_name: str, value: bool):
         """Set a feature flag value."""
+        self._ensure_loaded()
         self.features[feature_name] = value
-        self.save_config()
+        self._schedule_save()
     
     def get_model(self, model_type: str = "default") -> str:
         """Get model configuration."""
+        self._ensure_loaded()
         if model_type == "default":
             return self.models.get("default_model", "claude-4-sonnet")
         return self.models.get(model_type)
     
     def set_model(self, model_type: str, value: str):
         """Set model configuration."""
+        self._ensure_loaded()
         self.models[model_type] = value
-        self.save_config()
+        self._schedule_save()
     
-    def get_available_models(self, provider: str) -> list:
+    def get_available_models(self, provider: str) -> Sequence[str]:
         """Get available models for a provider."""
+        self._ensure_loaded()
         if provider == "claude":
-            return self.models.get("available_claude_models", [])
+            return self.models.get("available_claude_models", ())
         elif provider == "openai":
-            return self.models.get("available_openai_models", [])
-        return []
+            return self.models.get("available_openai_models", ())
+        return ()
 
 
 # Global config instance
@@ -1,33 +1,142 @@
 """Voice recording module with silence detection."""
 
-import io
+import collections
+import functools
 import logging
 import numpy as np
-import tempfile
-import time
+import queue
+import struct
 import threading
-from typing import Optional
+from typing import Callable, Optional, Union
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 try:
     import sounddevice as sd
-    import soundfile as sf
     SOUNDDEVICE_AVAILABLE = True
     logger.info("✅ Sounddevice available for recording")
 except ImportError:
     SOUNDDEVICE_AVAILABLE = False
     logger.warning("⚠️ Sounddevice not available for recording")
 
-try:
-    import pygame
-    pygame.mixer.init()
-    PYGAME_AVAILABLE = True
-    logger.info("✅ Pygame available for sound effects")
-except ImportError:
-    PYGAME_AVAILABLE = False
-    logger.warning("⚠️ Pygame not available for sound effects")
+
+def _sweep(
+    x: np.ndarray, freq_start: float, freq_end: float, duration: float, fade: np.ndarray
+) -> np.ndarray:
+    """Render a faded linear chirp into a single float32 buffer.
+
+    Uses the closed-form chirp phase 2*pi*T*x*(f0 + (f1 - f0)*x/2) with
+    x = t/T, so the instantaneous frequency moves exactly from f0 to f1.
+    All arithmetic is done in place so the only allocation is the output.
+    """
+    buf = np.multiply(x, 0.5 * (freq_end - freq_start), dtype=np.float32)
+    buf += freq_start
+    buf *= x
+    buf *= 2 * np.pi * duration
+    np.sin(buf, out=buf)
+    buf *= fade
+    return buf
+
+
+@functools.lru_cache(maxsize=8)
+def _make_feedback_sounds(sample_rate: int) -> tuple[np.ndarray, np.ndarray]:
+    """Generate pleasant start and stop recording sounds.
+
+    The sounds only depend on the sample rate, so they are cached and shared
+    between recorder instances. The returned arrays are read-only.
+    """
+    try:
+        duration = 0.3
+        n = int(sample_rate * duration)
+        
+        # Normalized time axis shared by both sweeps and the fade envelope
+        x = np.linspace(0, 1, n, dtype=np.float32)
+        
+        # Fade in/out envelope, pre-scaled to the output volume
+        fade = 1 - x
+        fade *= x
+        fade *= 0.3
+        
+        # Ascending "start recording" chime (A4 -> E5) and
+        # descending "stop recording" chime (E5 -> A4)
+        start_sound = _sweep(x, 440, 660, duration, fade)
+        stop_sound = _sweep(x, 660, 440, duration, fade)
+        
+        # Store as 16-bit PCM: inaudible difference for short chimes and half
+        # the bytes handed to sounddevice (which plays int16 natively)
+        start_sound = (start_sound * 32767).astype(np.int16)
+        stop_sound = (stop_sound * 32767).astype(np.int16)
+        
+        logger.info("✅ Generated pleasant audio feedback sounds")
+        
+    except Exception as e:
+        logger.warning(f"⚠️ Could not generate feedback sounds: {e}")
+        # Create silent fallback sounds
+        start_sound = np.zeros(int(sample_rate * 0.1), dtype=np.int16)
+        stop_sound = np.zeros(int(sample_rate * 0.1), dtype=np.int16)
+    
+    # Shared through the cache, so guard against accidental mutation
+    start_sound.setflags(write=False)
+    stop_sound.setflags(write=False)
+    return start_sound, stop_sound
+
+
+def _downmix_mono(indata: np.ndarray, out: np.ndarray) -> None:
+    """Copy a single-channel block into ``out``."""
+    np.copyto(out, indata[:, 0])
+
+
+def _downmix_stereo(indata: np.ndarray, out: np.ndarray) -> None:
+    """Average L and R into ``out`` with two elementwise passes."""
+    np.add(indata[:, 0], indata[:, 1], out=out)
+    out *= 0.5
+
+
+def _downmix_multi(indata: np.ndarray, out: np.ndarray) -> None:
+    """Average any number of channels into ``out``."""
+    np.mean(indata, axis=1, out=out)
+
+
+def _select_downmix(channels: int) -> Callable[[np.ndarray, np.ndarray], None]:
+    """Pick the mono downmix routine for a channel count."""
+    if channels == 1:
+        return _downmix_mono
+    if channels == 2:
+        return _downmix_stereo
+    return _downmix_multi
+
+
+def _wav_header(num_samples: int, sample_rate: int) -> bytes:
+    """Build the 44-byte RIFF header for mono 16-bit PCM audio."""
+    data_len = num_samples * 2
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_len, b'WAVE',
+        b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b'data', data_len
+    )
+
+
+def _fx_loop(fx_queue: queue.SimpleQueue, sample_rate: int) -> None:
+    """Play queued feedback sounds one after another until a None arrives.
+
+    Kept at module level (not a bound method) so the worker thread does not
+    keep its recorder alive.
+    """
+    while True:
+        item = fx_queue.get()
+        if item is None:
+            break
+        sound, on_done = item
+        try:
+            sd.play(sound, sample_rate)
+            sd.wait()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not play feedback sound: {e}")
+        finally:
+            if on_done is not None:
+                on_done()
 
 
 class VoiceRecorder:
@@ -60,127 +169,138 @@ class VoiceRecorder:
         self.min_recording_time = min_recording_time
         
         self.is_recording = False
-        self.audio_data = []
-        self.recording_thread: Optional[threading.Thread] = None
-        self.monitoring_thread: Optional[threading.Thread] = None
+        self._capture_enabled = False  # Samples are kept only once the start chime ends
         self.stop_event = threading.Event()
         self.stream = None
         
-        # Generate pleasant audio feedback sounds
-        self._generate_feedback_sounds()
+        # Preallocated capture buffer; the audio callback writes straight into it
+        self._audio_buf = np.empty(
+            int(self.max_recording_time * self.sample_rate), dtype=np.float32
+        )
+        self._write_pos = 0
+        
+        # Pleasant audio feedback sounds (shared across instances)
+        self.start_sound, self.stop_sound = _make_feedback_sounds(sample_rate)
+        
+        # Single long-lived worker that plays feedback sounds in order
+        self._fx_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._fx_thread: Optional[threading.Thread] = None
+        if SOUNDDEVICE_AVAILABLE:
+            self._fx_thread = threading.Thread(
+                target=_fx_loop,
+                args=(self._fx_queue, sample_rate),
+                name="sfx",
+                daemon=True
+            )
+            self._fx_thread.start()
     
-    def _generate_feedback_sounds(self):
-        """Generate pleasant start and stop recording sounds."""
-        try:
-            # Generate a pleasant "start recording" sound (ascending chime)
-            duration = 0.3
-            freq_start = 440  # A4
-            freq_end = 660    # E5
-            t = np.linspace(0, duration, int(self.sample_rate * duration))
-            frequency = np.linspace(freq_start, freq_end, len(t))
-            
-            # Create ascending chime with fade in/out
-            start_sound = np.sin(2 * np.pi * frequency * t)
-            fade = np.linspace(0, 1, len(t)) * np.linspace(1, 0, len(t))
-            self.start_sound = (start_sound * fade * 0.3).astype(np.float32)
-            
-            # Generate a pleasant "stop recording" sound (descending chime)
-            freq_start = 660  # E5
-            freq_end = 440    # A4
-            frequency = np.linspace(freq_start, freq_end, len(t))
-            stop_sound = np.sin(2 * np.pi * frequency * t)
-            self.stop_sound = (stop_sound * fade * 0.3).astype(np.float32)
-            
-            logger.info("✅ Generated pleasant audio feedback sounds")
-            
-        except Exception as e:
-            logger.warning(f"⚠️ Could not generate feedback sounds: {e}")
-            # Create silent fallback sounds
-            self.start_sound = np.zeros(int(self.sample_rate * 0.1), dtype=np.float32)
-            self.stop_sound = np.zeros(int(self.sample_rate * 0.1), dtype=np.float32)
+    def __del__(self):
+        fx_queue = getattr(self, "_fx_queue", None)
+        if fx_queue is not None:
+            fx_queue.put(None)  # Stop the feedback sound worker
     
-    def _play_feedback_sound(self, sound: np.ndarray):
-        """Play a feedback sound asynchronously."""
+    def _play_feedback_sound(
+        self, sound: np.ndarray, on_done: Optional[Callable[[], None]] = None
+    ):
+        """Play a feedback sound asynchronously.
+        
+        Args:
+            sound: Samples to play
+            on_done: Optional callback run on the worker once playback finished
+        """
         try:
             if SOUNDDEVICE_AVAILABLE:
-                # Play sound without blocking
-                threading.Thread(
-                    target=lambda: sd.play(sound, self.sample_rate),
-                    daemon=True
-                ).start()
+                # Hand off to the feedback worker without blocking
+                self._fx_queue.put((sound, on_done))
                 logger.info("🔊 Played feedback sound")
             else:
                 logger.info("🔇 Feedback sound skipped (no audio device)")
+                if on_done is not None:
+                    on_done()
         except Exception as e:
             logger.warning(f"⚠️ Could not play feedback sound: {e}")
+            if on_done is not None:
+                on_done()
     
-    def _audio_callback(self, indata, frames, time, status):
-        """Callback function for audio recording."""
-        if status:
-            logger.warning(f"⚠️ Audio callback status: {status}")
+    def _make_audio_callback(self) -> Callable:
+        """Build the stream callback for one recording.
         
-        if self.is_recording:
-            # Convert to mono if stereo
-            if indata.shape[1] > 1:
-                audio_chunk = np.mean(indata, axis=1)
-            else:
-                audio_chunk = indata[:, 0]
-            
-            # Make a copy to avoid reference issues
-            self.audio_data.append(audio_chunk.copy())
-    
-    def _monitor_silence(self):
-        """Monitor for silence and auto-stop recording."""
-        logger.info("🔍 Silence monitoring thread started")
-        silence_start = None
-        last_chunk_time = time.time()
+        Everything the callback touches per block is bound to closure
+        locals here, so the hot path avoids instance attribute lookups.
+        The energy window and silence counters live in the closure too,
+        which makes each new stream start from a clean state.
+        """
+        recorder = self
+        stop_event = self.stop_event
+        audio_buf = self._audio_buf
+        buf_len = len(audio_buf)
+        downmix = _select_downmix(self.channels)
+        sample_rate = self.sample_rate
+        min_samples = int(self.min_recording_time * sample_rate)
+        silence_samples = int(self.silence_duration * sample_rate)
+        threshold_sq = self.silence_threshold ** 2
+        
+        # Running sum of squares over the most recent ~200 ms of audio
+        window: collections.deque = collections.deque()
+        window_samples = int(0.2 * sample_rate)
+        ss_recent = 0.0
+        ss_count = 0
+        silent_samples = 0
         
-        while self.is_recording and not self.stop_event.is_set():
-            current_time = time.time()
-            recording_duration = current_time - self.recording_start_time
+        def callback(indata, frames, time, status):
+            nonlocal ss_recent, ss_count, silent_samples
+            if status:
+                logger.warning(f"⚠️ Audio callback status: {status}")
             
-            # Don't check for silence until minimum recording time has passed
-            if recording_duration < self.min_recording_time:
-                time.sleep(0.1)
-                continue
+            if not recorder._capture_enabled or stop_event.is_set():
+                return
             
-            # Check if we have recent audio data
-            if len(self.audio_data) > 0:
-                # Get the most recent audio chunk
-                recent_audio = self.audio_data[-1] if self.audio_data else np.array([])
-                
-                if len(recent_audio) > 0:
-                    # Calculate volume (RMS)
-                    volume = np.sqrt(np.mean(recent_audio ** 2))
-                    
-                    if volume < self.silence_threshold:
-                        # Silence detected
-                        if silence_start is None:
-                            silence_start = current_time
-                            logger.info(f"🔇 Silence detected (volume: {volume:.4f}) after {recording_duration:.1f}s")
-                        elif current_time - silence_start >= self.silence_duration:
-                            logger.info(f"🔇 Auto-stopping recording after {self.silence_duration}s of silence (total: {recording_duration:.1f}s)")
-                            self.stop_event.set()  # Signal to stop instead of calling stop_recording
-                            break
-                    else:
-                        # Sound detected, reset silence timer
-                        if silence_start is not None:
-                            logger.info(f"🔊 Sound detected, continuing recording (volume: {volume:.4f})")
-                        silence_start = None
-                    
-                    last_chunk_time = current_time
+            # Single producer: only this callback advances the write position,
+            # and readers only look at samples below the published position
+            pos = recorder._write_pos
+            n = min(len(indata), buf_len - pos)
+            if n <= 0:
+                return
+            chunk = audio_buf[pos:pos + n]
+            
+            # Mix down to mono directly into the capture buffer
+            # (sounddevice reuses indata, so it must be copied out)
+            downmix(indata[:n], chunk)
+            
+            # Update the sliding energy window with the new samples only
+            ss = float(np.dot(chunk, chunk))
+            window.append((ss, n))
+            ss_recent += ss
+            ss_count += n
+            while ss_count - window[0][1] >= window_samples:
+                old_ss, old_n = window.popleft()
+                ss_recent -= old_ss
+                ss_count -= old_n
             
-            # Check maximum recording time
-            if hasattr(self, 'recording_start_time'):
-                if current_time - self.recording_start_time >= self.max_recording_time:
-                    logger.info(f"⏰ Max recording time ({self.max_recording_time}s) reached")
-                    self.stop_event.set()  # Signal to stop instead of calling stop_recording
-                    break
+            # Publish with a single attribute store (atomic under the GIL)
+            recorded = pos + n
+            recorder._write_pos = recorded
             
-            # Sleep briefly to avoid busy waiting
-            time.sleep(0.1)
+            # Silence detection: count consecutive quiet samples once the
+            # minimum recording time has passed, comparing in the squared domain
+            if recorded >= min_samples:
+                if ss_recent < threshold_sq * ss_count:
+                    silent_samples += n
+                else:
+                    silent_samples = 0
+                
+                if silent_samples >= silence_samples:
+                    logger.info(f"🔇 Auto-stopping recording after {recorder.silence_duration}s of silence (total: {recorded / sample_rate:.1f}s)")
+                    # Only signal here; teardown happens outside the PortAudio callback
+                    stop_event.set()
+                    return
+            
+            # Check maximum recording time (capture buffer is full)
+            if recorded >= buf_len:
+                logger.info(f"⏰ Max recording time ({recorder.max_recording_time}s) reached")
+                stop_event.set()
         
-        logger.info("🔍 Silence monitoring thread ending")
+        return callback
     
     def start_recording(self):
         """Start voice recording with pleasant feedback sound."""
@@ -190,40 +310,28 @@ class VoiceRecorder:
         
         if self.is_recording:
             logger.warning("⚠️ Recording already in progress")
-            logger.warning(f"⚠️ Current state: is_recording={self.is_recording}, thread_alive={self.monitoring_thread.is_alive() if self.monitoring_thread else 'None'}")
+            logger.warning(f"⚠️ Current state: is_recording={self.is_recording}, stop_requested={self.stop_event.is_set()}")
             return False
         
         try:
             logger.info("🎤 Starting voice recording...")
             
-            # Play start sound
-            self._play_feedback_sound(self.start_sound)
-            
-            # Wait briefly for start sound to play
-            time.sleep(0.4)
-            
-            # Clean up any existing threads first
-            if self.monitoring_thread is not None and self.monitoring_thread.is_alive():
-                self.stop_event.set()
-                self.monitoring_thread.join(timeout=1.0)
-            
             # Reset recording state
             self.reset()
             self.is_recording = True
-            self.recording_start_time = time.time()
             
-            # Start recording stream
+            # Open the input stream right away so device warm-up overlaps the
+            # start chime; the callback drops samples until capture is enabled
             self.stream = sd.InputStream(
                 samplerate=self.sample_rate,
                 channels=self.channels,
-                callback=self._audio_callback,
+                callback=self._make_audio_callback(),
                 dtype='float32'
             )
             self.stream.start()
             
-            # Start silence monitoring in a separate thread
-            self.monitoring_thread = threading.Thread(target=self._monitor_silence, daemon=True)
-            self.monitoring_thread.start()
+            # Play start sound, then begin capturing once it has finished
+            self._play_feedback_sound(self.start_sound, on_done=self._begin_capture)
             
             logger.info("✅ Voice recording started with silence detection")
             return True
@@ -233,6 +341,11 @@ class VoiceRecorder:
             self.is_recording = False
             return False
     
+    def _begin_capture(self):
+        """Start keeping samples (runs on the feedback worker after the start chime)."""
+        if self.is_recording and not self.stop_event.is_set():
+            self._capture_enabled = True
+    
     def reset(self):
         """Reset the recorder to a clean state."""
         logger.info("🔄 Resetting voice recorder state...")
@@ -251,28 +364,22 @@ class VoiceRecorder:
                 logger.warning(f"⚠️ Error closing stream during reset: {e}")
             self.stream = None
         
-        # Wait for monitoring thread to finish
-        if self.monitoring_thread is not None and self.monitoring_thread.is_alive():
-            try:
-                if self.monitoring_thread != threading.current_thread():
-                    self.monitoring_thread.join(timeout=2.0)
-                    if self.monitoring_thread.is_alive():
-                        logger.warning("⚠️ Monitoring thread didn't terminate gracefully")
-            except Exception as e:
-                logger.warning(f"⚠️ Error joining monitoring thread: {e}")
-        
         # Reset all state variables
         self.is_recording = False
-        self.audio_data = []
-        self.recording_thread = None
-        self.monitoring_thread = None
+        self._capture_enabled = False
+        self._write_pos = 0
         self.stop_event.clear()
         
         logger.info("✅ Voice recorder state reset complete")
     
-    def stop_recording(self) -> Optional[bytes]:
-        """Stop recording and return audio data as WAV bytes."""
-        if not self.is_recording and len(self.audio_data) == 0:
+    def stop_recording(self, to_path: Optional[str] = None) -> Optional[Union[bytes, str]]:
+        """Stop recording and return audio data as WAV bytes.
+        
+        Args:
+            to_path: If given, write the WAV file directly to this path and
+                return the path instead of the WAV bytes
+        """
+        if not self.is_recording and self._write_pos == 0:
             logger.warning("⚠️ No recording in progress")
             return None
         
@@ -283,6 +390,7 @@ class VoiceRecorder:
                 
                 # Signal stop
                 self.is_recording = False
+                self._capture_enabled = False
                 self.stop_event.set()
                 
                 # Stop recording stream
@@ -293,42 +401,38 @@ class VoiceRecorder:
                 
                 # Play stop sound
                 self._play_feedback_sound(self.stop_sound)
-                
-                # Wait for monitoring thread to finish (with timeout and proper thread check)
-                if self.monitoring_thread is not None and self.monitoring_thread.is_alive():
-                    try:
-                        # Check if we're not trying to join the current thread
-                        if self.monitoring_thread != threading.current_thread():
-                            self.monitoring_thread.join(timeout=2.0)
-                            if self.monitoring_thread.is_alive():
-                                logger.warning("⚠️ Monitoring thread didn't terminate within timeout")
-                        else:
-                            logger.warning("⚠️ Skipping thread join - monitoring thread is current thread")
-                    except Exception as e:
-                        logger.warning(f"⚠️ Error joining monitoring thread: {e}")
-                    finally:
-                        # Clear the thread reference regardless
-                        self.monitoring_thread = None
             else:
                 logger.info("🛑 Recording already stopped, processing audio data...")
             
             # Process recorded audio
-            if len(self.audio_data) == 0:
+            if self._write_pos == 0:
                 logger.warning("⚠️ No audio data recorded")
                 return None
             
-            # Concatenate all audio chunks
-            full_audio = np.concatenate(self.audio_data)
+            # View of the recorded samples (no concatenation needed)
+            full_audio = self._audio_buf[:self._write_pos]
             logger.info(f"🎵 Recorded {len(full_audio)} samples ({len(full_audio)/self.sample_rate:.2f}s)")
             
+            # Quantize to 16-bit PCM (half the size of float WAV, fine for speech)
+            pcm = np.multiply(full_audio, 32767.0, dtype=np.float32)
+            np.clip(pcm, -32768, 32767, out=pcm)
+            pcm = pcm.astype('<i2')
+            header = _wav_header(len(pcm), self.sample_rate)
+            
+            if to_path is not None:
+                # Write the file directly (no in-memory WAV copy)
+                with open(to_path, 'wb') as f:
+                    f.write(header)
+                    pcm.tofile(f)
+                self._write_pos = 0
+                logger.info(f"✅ Voice recording saved to: {to_path}")
+                return to_path
+            
             # Convert to WAV bytes
-            buffer = io.BytesIO()
-            sf.write(buffer, full_audio, self.sample_rate, format='WAV')
-            buffer.seek(0)
-            audio_bytes = buffer.getvalue()
+            audio_bytes = header + pcm.tobytes()
             
             # Clear audio data after processing (but don't reset everything)
-            self.audio_data = []
+            self._write_pos = 0
             
             logger.info(f"✅ Voice recording completed: {len(audio_bytes)} bytes")
             return audio_bytes
@@ -338,17 +442,34 @@ class VoiceRecorder:
             return None
     
     def is_recording_active(self) -> bool:
-        """Check if recording is currently active."""
-        return self.is_recording
+        """Check if recording is currently active (not yet auto-stopped)."""
+        return self.is_recording and not self.stop_event.is_set()
+    
+    def wait_for_stop(self, timeout: Optional[float] = None) -> bool:
+        """Block until the recording auto-stops or is asked to stop.
+        
+        Args:
+            timeout: Maximum number of seconds to wait
+        
+        Returns:
+            True if the recording stopped, False if the wait timed out
+        """
+        if not self.is_recording:
+            return True
+        return self.stop_event.wait(timeout)
 
 
 # Global recorder instance
 _recorder_instance: Optional[VoiceRecorder] = None
+_recorder_lock = threading.Lock()
 
 
 def get_voice_recorder() -> VoiceRecorder:
     """Get or create the global voice recorder instance."""
     global _recorder_instance
     if _recorder_instance is None:
-        _recorder_instance = VoiceRecorder()
+        # Double-checked so concurrent first calls build only one recorder
+        with _recorder_lock:
+            if _recorder_instance is None:
+                _recorder_instance = VoiceRecorder()
     return _recorder_instance 
\ No newline at end of file
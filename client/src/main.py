@@ -1,13 +1,23 @@
+import atexit
+import base64
+import hashlib
 import io
-import tempfile
+import json
 import os
 import logging
+import logging.handlers
+import queue
 import time
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
 
 import keyboard
+import numpy as np
 import requests
-from PIL import ImageGrab
+from PIL import Image, ImageGrab
 
 # Add the current directory to path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -15,133 +25,519 @@ if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
 from core.voice_recorder import get_voice_recorder
-from ui.overlay import get_overlay, get_root
+from ui.overlay import get_overlay, get_root, run_on_ui_thread
 from core.config import get_config
 
-# Set up logging for Windows compatibility
-import sys
-import os
-
 # Configure console encoding for Windows
 if sys.platform == "win32":
-    # Set console to UTF-8 mode on Windows
-    os.system("chcp 65001 > nul")
+    # Set console to UTF-8 mode directly instead of spawning `chcp 65001`
+    import ctypes
+    ctypes.windll.kernel32.SetConsoleOutputCP(65001)
+    ctypes.windll.kernel32.SetConsoleCP(65001)
+
+# Log records are handed to a queue and written by a listener thread, so
+# console and file I/O never run on the hotkey or audio threads
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.StreamHandler(),
+    logging.FileHandler('client.log', encoding='utf-8')
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('client.log', encoding='utf-8')
-    ]
+    format='%(message)s',  # Final formatting happens in the listener's handlers
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
-# Try to import pygame for audio playback
-try:
-    import pygame
-    pygame.mixer.init()
-    PYGAME_AVAILABLE = True
-    logger.info("✅ Pygame audio available")
-except ImportError:
-    PYGAME_AVAILABLE = False
-    logger.warning("⚠️ Pygame not available")
+# Playback libraries are imported on first use (see _load_audio_backends):
+# pygame's SDL mixer init and PortAudio device enumeration otherwise add
+# noticeably to client start-up, and are never needed while TTS is off
+pygame = sd = sf = pyaudio = wave = None
+PYGAME_AVAILABLE = SOUNDDEVICE_AVAILABLE = PYAUDIO_AVAILABLE = AUDIO_AVAILABLE = False
+_audio_backends_loaded = False
+PYGAME_MIXER_BUFFER = 4096  # Samples per mixer period (~90 ms at 44.1 kHz)
+_audio_backends_lock = threading.Lock()
 
-# Try alternative audio libraries
 try:
-    import sounddevice as sd
-    import soundfile as sf
-    SOUNDDEVICE_AVAILABLE = True
-    logger.info("✅ Sounddevice audio available")
+    import mss
+    MSS_AVAILABLE = True
+    logger.info("✅ mss screen capture available")
 except ImportError:
-    SOUNDDEVICE_AVAILABLE = False
-    logger.warning("⚠️ Sounddevice not available")
+    MSS_AVAILABLE = False
+    logger.warning("⚠️ mss not available - falling back to PIL ImageGrab")
 
+# libjpeg-turbo bindings encode noticeably faster than Pillow's JPEG writer
 try:
-    import pyaudio
-    import wave
-    PYAUDIO_AVAILABLE = True
-    logger.info("✅ PyAudio available")
-except ImportError:
-    PYAUDIO_AVAILABLE = False
-    logger.warning("⚠️ PyAudio not available")
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _turbo_jpeg = TurboJPEG()
+    TURBOJPEG_AVAILABLE = True
+    logger.info("✅ TurboJPEG encoder available")
+except Exception as e:
+    # Besides a missing package, PyTurboJPEG raises (RuntimeError, OSError)
+    # when the libjpeg-turbo shared library itself cannot be found or loaded
+    TURBOJPEG_AVAILABLE = False
+    logger.debug(f"TurboJPEG unavailable ({e}) - using Pillow JPEG encoder")
 
-if not (PYGAME_AVAILABLE or SOUNDDEVICE_AVAILABLE or PYAUDIO_AVAILABLE):
-    logger.error("❌ No audio libraries available - audio playback disabled")
-    AUDIO_AVAILABLE = False
-else:
-    AUDIO_AVAILABLE = True
 
+# Screenshots are uploaded as JPEG by default: encoding is several times faster
+# than PNG and the payload is far smaller, with no difference the vision models
+# notice. The "screenshot_format" feature setting can switch back to PNG.
+SCREENSHOT_UPLOAD_TYPES = {
+    "jpeg": ("screenshot.jpg", "image/jpeg"),
+    "png": ("screenshot.png", "image/png"),
+}
+SCREENSHOT_JPEG_QUALITY = 85
+# Longest edge sent to the server. Claude's vision input tops out at 1568 px
+# and larger images are shrunk server-side anyway, so full-resolution
+# desktops are downscaled before encoding
+SCREENSHOT_MAX_EDGE = 1568
 
-def play_audio(audio_path):
-    """Play audio using the best available library."""
-    config = get_config()
-    
-    logger.info(f"🎵 Audio file generated: {audio_path}")
-    logger.info(f"📊 Audio file size: {os.path.getsize(audio_path)} bytes")
-    
-    # Check feature flag for TTS
-    if not config.get_feature("use_tts"):
-        logger.info(f"🔇 TTS disabled by feature flag. Audio saved to: {audio_path}")
+# Encode buffer reused across captures (hotkey handlers run one at a time),
+# and the (filename, MIME type) of the image currently held in it
+_screenshot_buffer = io.BytesIO()
+_screenshot_upload_type = SCREENSHOT_UPLOAD_TYPES["jpeg"]
+
+# Literal IPv4 loopback: skips name resolution, and on Windows avoids trying
+# ::1 first (uvicorn binds 127.0.0.1 by default) before falling back
+API_BASE_URL = "http://127.0.0.1:8000/api/v1"
+# Header in which the server returns the text of an audio response (base64)
+RESPONSE_TEXT_HEADER = "X-Response-Text"
+# Header the server sets to "1" when the audio is an error/fallback message
+RESPONSE_FALLBACK_HEADER = "X-Response-Fallback"
+
+# Results of recent screenshot-only analyses keyed by (endpoint, digest of the
+# encoded frame), so pressing a hotkey again on an unchanged screen skips the
+# round trip. Only successful analyses are stored.
+ANALYSIS_CACHE_SIZE = 8
+ANALYSIS_CACHE_TTL_SECONDS = 30.0
+_analysis_cache: OrderedDict = OrderedDict()
+
+# Shared HTTP session so every request reuses a keep-alive connection to the
+# local server instead of opening a new socket per call
+_session = requests.Session()
+
+# Hotkey actions run on a single worker so the keyboard hook never blocks;
+# presses that arrive while an action is still running are dropped
+_hotkey_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hotkey")
+_hotkey_inflight: Optional[Future] = None
+
+
+def run_hotkey_action(action: Callable[[], None]) -> None:
+    """Run a hotkey action in the background unless one is already running."""
+    global _hotkey_inflight
+    if _hotkey_inflight is not None and not _hotkey_inflight.done():
+        logger.info("⏳ Ignoring %s: previous request still running", action.__name__)
         return
+    _hotkey_inflight = _hotkey_executor.submit(action)
+
+
+# mss grabber, created lazily on the hotkey worker that uses it and then kept
+# so its device contexts are not reopened on every capture
+_sct = None
+
+
+def capture_screenshot() -> Image.Image:
+    """Capture the primary monitor, preferring mss over PIL ImageGrab."""
+    global _sct
+    if MSS_AVAILABLE:
+        if _sct is None:
+            _sct = mss.mss()
+        raw = _sct.grab(_sct.monitors[1])
+        # Wrap mss's BGRA buffer directly instead of building an RGB copy
+        return Image.frombuffer("RGB", raw.size, raw.bgra, "raw", "BGRX")
+    return ImageGrab.grab()
+
+
+def _prepare_screenshot(screenshot) -> Image.Image:
+    """Downscale a capture to SCREENSHOT_MAX_EDGE and make sure it is RGB.
     
-    if not AUDIO_AVAILABLE:
-        logger.warning(f"💾 Audio saved to: {audio_path}")
-        return
+    Returns a new image when any work is needed; the capture is left untouched.
+    """
+    width, height = screenshot.size
+    longest = max(width, height)
+    if longest > SCREENSHOT_MAX_EDGE:
+        scale = SCREENSHOT_MAX_EDGE / longest
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        # Bilinear is much cheaper than the default Lanczos and plenty for analysis
+        screenshot = screenshot.resize(size, Image.Resampling.BILINEAR)
+    if screenshot.mode != "RGB":
+        screenshot = screenshot.convert("RGB")
+    return screenshot
+
+
+def encode_screenshot(screenshot) -> io.BytesIO:
+    """Downscale a screenshot and encode it into the shared upload buffer."""
+    global _screenshot_upload_type
+    image_format = get_config().get_setting("screenshot_format", "jpeg")
+    if image_format not in SCREENSHOT_UPLOAD_TYPES:
+        image_format = "jpeg"
+    _screenshot_upload_type = SCREENSHOT_UPLOAD_TYPES[image_format]
     
+    buffer = _screenshot_buffer
+    # Overwrite from the start and trim afterwards: truncating first would
+    # drop the allocation and make every capture regrow the buffer
+    buffer.seek(0)
+    screenshot = _prepare_screenshot(screenshot)
+    if image_format == "png":
+        # Fast zlib level: the upload is local, so encode time matters more
+        # than the slightly larger file
+        screenshot.save(buffer, format="PNG", compress_level=1, optimize=False)
+    elif TURBOJPEG_AVAILABLE:
+        buffer.write(_turbo_jpeg.encode(
+            np.asarray(screenshot), quality=SCREENSHOT_JPEG_QUALITY, pixel_format=TJPF_RGB
+        ))
+    else:
+        screenshot.save(buffer, format="JPEG", quality=SCREENSHOT_JPEG_QUALITY)
+    buffer.truncate()
+    buffer.seek(0)
+    return buffer
+
+
+def encode_during_recording(screenshot, recorder) -> io.BytesIO:
+    """Encode a screenshot while a recording runs, stopping it if encoding fails."""
     try:
-        # Try sounddevice first (most compatible)
-        if SOUNDDEVICE_AVAILABLE:
-            logger.info("🔊 Using sounddevice for audio playback")
-            data, samplerate = sf.read(audio_path)
-            logger.info(f"📊 Audio data shape: {data.shape}, sample rate: {samplerate}")
-            sd.play(data, samplerate)
-            sd.wait()  # Wait until the audio is finished playing
-            logger.info("✅ Audio playback finished (sounddevice)")
-            return
-    except Exception as e:
-        logger.error(f"❌ sounddevice failed: {e}")
+        return encode_screenshot(screenshot)
+    except Exception:
+        # Don't leave the microphone stream open behind a failed hotkey
+        recorder.stop_recording()
+        raise
+
+
+def screenshot_digest(buffer: io.BytesIO) -> bytes:
+    """Digest of an encoded screenshot, used as the analysis cache key.
+    
+    The whole encoded image is hashed, so only pixel-identical frames share
+    a cached result; any visible change on screen produces a new key.
+    """
+    with buffer.getbuffer() as view:
+        return hashlib.blake2b(view, digest_size=16).digest()
+
+
+def get_cached_analysis(endpoint: str, frame_hash: bytes):
+    """Return the stored result for an unchanged frame, or None if absent/expired."""
+    key = (endpoint, frame_hash)
+    entry = _analysis_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, result = entry
+    if time.monotonic() - stored_at > ANALYSIS_CACHE_TTL_SECONDS:
+        del _analysis_cache[key]
+        return None
+    _analysis_cache.move_to_end(key)
+    return result
+
+
+def store_analysis(endpoint: str, frame_hash: bytes, result) -> None:
+    """Remember the result for a frame, evicting the least recently used entry."""
+    _analysis_cache[(endpoint, frame_hash)] = (time.monotonic(), result)
+    _analysis_cache.move_to_end((endpoint, frame_hash))
+    while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+        _analysis_cache.popitem(last=False)
+
+
+def capture_and_encode_screenshot(screenshot) -> io.BytesIO:
+    """Encode a captured screenshot into the shared upload buffer."""
+    buffer = encode_screenshot(screenshot)
+    logger.info("📸 Screenshot saved to buffer: %s bytes", buffer.getbuffer().nbytes)
+    return buffer
+
+
+def post_to_server(
+    endpoint: str,
+    screenshot: Optional[io.BytesIO] = None,
+    audio_bytes: Optional[bytes] = None,
+    data: Optional[dict] = None,
+    timeout: float = 30,
+) -> requests.Response:
+    """POST a screenshot and/or voice clip to a server API endpoint.
     
+    Args:
+        endpoint: Path below the API root, e.g. "image/analyze"
+        screenshot: Encoded screenshot buffer (rewound before sending)
+        audio_bytes: WAV-encoded voice recording
+        data: Extra form fields
+        timeout: Request timeout in seconds
+    """
+    files = {}
+    if screenshot is not None:
+        screenshot.seek(0)
+        filename, mimetype = _screenshot_upload_type
+        files["image"] = (filename, screenshot, mimetype)
+    if audio_bytes is not None:
+        files["audio"] = ("voice.wav", audio_bytes, "audio/wav")
+    return _session.post(f"{API_BASE_URL}/{endpoint}", files=files or None, data=data, timeout=timeout)
+
+
+def response_text(response: requests.Response) -> Optional[str]:
+    """Return the spoken text the server attached to an audio response, if any."""
+    encoded = response.headers.get(RESPONSE_TEXT_HEADER)
+    if not encoded:
+        return None
     try:
-        # Try pygame second
-        if PYGAME_AVAILABLE:
-            logger.info("🔊 Using pygame for audio playback")
-            pygame.mixer.music.load(audio_path)
-            pygame.mixer.music.play()
-            while pygame.mixer.music.get_busy():
-                pygame.time.wait(100)
-            logger.info("✅ Audio playback finished (pygame)")
-            return
+        return base64.b64decode(encoded, validate=True).decode("utf-8") or None
+    except (ValueError, UnicodeDecodeError) as e:
+        logger.warning(f"⚠️ Could not decode {RESPONSE_TEXT_HEADER} header: {e}")
+        return None
+
+
+def is_fallback_response(response: requests.Response) -> bool:
+    """Whether the server marked an audio response as an error/fallback message."""
+    return response.headers.get(RESPONSE_FALLBACK_HEADER) == "1"
+
+
+def _init_sounddevice() -> bool:
+    """Import sounddevice and soundfile for playback."""
+    global sd, sf, SOUNDDEVICE_AVAILABLE
+    try:
+        import sounddevice as sd
+        import soundfile as sf
+    except (ImportError, OSError) as e:
+        logger.warning(f"⚠️ Sounddevice not available: {e}")
+        return False
+    SOUNDDEVICE_AVAILABLE = True
+    logger.info("✅ Sounddevice audio available")
+    return True
+
+
+def _init_pygame() -> bool:
+    """Import pygame and open its mixer on the default output device."""
+    global pygame, PYGAME_AVAILABLE
+    try:
+        import pygame
+        # Responses are not interactive, so a large mixer buffer costs
+        # nothing noticeable and keeps playback from underrunning under load
+        pygame.mixer.init(buffer=PYGAME_MIXER_BUFFER)
+    except ImportError:
+        logger.warning("⚠️ Pygame not available")
+        return False
     except Exception as e:
-        logger.error(f"❌ pygame failed: {e}")
-    
+        # pygame.error, e.g. when there is no usable output device
+        logger.warning(f"⚠️ Pygame mixer could not be opened: {e}")
+        return False
+    PYGAME_AVAILABLE = True
+    logger.info("✅ Pygame audio available")
+    return True
+
+
+def _init_pyaudio() -> bool:
+    """Import PyAudio and the wave reader it plays from."""
+    global pyaudio, wave, PYAUDIO_AVAILABLE
     try:
-        # Try pyaudio last
-        if PYAUDIO_AVAILABLE:
-            logger.info("🔊 Using pyaudio for audio playback")
-            wf = wave.open(audio_path, 'rb')
-            p = pyaudio.PyAudio()
-            stream = p.open(format=p.get_format_from_width(wf.getsampwidth()),
-                          channels=wf.getnchannels(),
-                          rate=wf.getframerate(),
-                          output=True)
-            
-            chunk = 1024
-            data = wf.readframes(chunk)
-            while data:
-                stream.write(data)
-                data = wf.readframes(chunk)
+        import pyaudio
+        import wave
+    except (ImportError, OSError) as e:
+        logger.warning(f"⚠️ PyAudio not available: {e}")
+        return False
+    PYAUDIO_AVAILABLE = True
+    logger.info("✅ PyAudio available")
+    return True
+
+
+def _load_audio_backends() -> None:
+    """Pick and initialise the playback backend once, on first playback.
+    
+    The configured "audio_backend" is tried first, then the others in the
+    "auto" order. Only libraries that are tried get imported, so an unused
+    backend never opens an audio device.
+    """
+    global AUDIO_AVAILABLE, _audio_backends_loaded, _play_impl
+    if _audio_backends_loaded:
+        return
+    with _audio_backends_lock:
+        if _audio_backends_loaded:
+            return
+        
+        preferred = get_config().get_setting("audio_backend", "auto")
+        order = list(AUDIO_BACKENDS)
+        if preferred in AUDIO_BACKENDS:
+            order.remove(preferred)
+            order.insert(0, preferred)
+        elif preferred != "auto":
+            logger.warning(f"⚠️ Unknown audio backend '{preferred}' - choosing automatically")
+        
+        for name in order:
+            init_backend, start_playback = AUDIO_BACKENDS[name]
+            if init_backend():
+                logger.info(f"🔊 Using {name} for audio playback")
+                _play_impl = start_playback
+                break
+            if name == preferred:
+                logger.warning(f"⚠️ Configured audio backend '{preferred}' not available - choosing automatically")
+        
+        AUDIO_AVAILABLE = _play_impl is not None
+        if not AUDIO_AVAILABLE:
+            logger.error("❌ No audio libraries available - audio playback disabled")
+        _audio_backends_loaded = True
+
+
+# Serializes PyAudio playback threads so clips never overlap
+_pyaudio_lock = threading.Lock()
+
+# PyAudio host API and output streams are expensive to open, so both are
+# kept for the lifetime of the client; streams are keyed by sample format
+_pyaudio_instance = None
+_pyaudio_streams: dict = {}
+
+
+def _get_pyaudio_stream(sample_width: int, channels: int, rate: int):
+    """Return a cached PyAudio output stream for the given format."""
+    global _pyaudio_instance
+    if _pyaudio_instance is None:
+        _pyaudio_instance = pyaudio.PyAudio()
+        atexit.register(_close_pyaudio)
+    key = (sample_width, channels, rate)
+    stream = _pyaudio_streams.get(key)
+    if stream is None:
+        stream = _pyaudio_instance.open(
+            format=_pyaudio_instance.get_format_from_width(sample_width),
+            channels=channels,
+            rate=rate,
+            output=True
+        )
+        _pyaudio_streams[key] = stream
+    elif stream.is_stopped():
+        stream.start_stream()
+    return stream
+
+
+def _close_pyaudio() -> None:
+    """Close cached PyAudio streams and release the host API."""
+    global _pyaudio_instance
+    with _pyaudio_lock:
+        for stream in _pyaudio_streams.values():
+            try:
+                stream.close()
+            except Exception:
+                pass
+        _pyaudio_streams.clear()
+        if _pyaudio_instance is not None:
+            _pyaudio_instance.terminate()
+            _pyaudio_instance = None
+
+
+def _play_with_pyaudio(audio_bytes: bytes) -> None:
+    """Play WAV bytes through PyAudio (blocking; run on a playback thread)."""
+    with _pyaudio_lock:
+        try:
+            with wave.open(io.BytesIO(audio_bytes), 'rb') as wf:
+                stream = _get_pyaudio_stream(wf.getsampwidth(), wf.getnchannels(), wf.getframerate())
+                # One blocking write; PortAudio paces the whole clip itself
+                stream.write(wf.readframes(wf.getnframes()))
             
+            # Drain and pause the stream, but keep it open for the next clip
             stream.stop_stream()
-            stream.close()
-            p.terminate()
-            wf.close()
             logger.info("✅ Audio playback finished (pyaudio)")
-            return
+        except Exception as e:
+            logger.error(f"❌ pyaudio failed: {e}")
+
+
+# Stop flag of the sounddevice clip currently playing, if any
+_sd_playback_stop: Optional[threading.Event] = None
+
+# Frames handed to PortAudio per blocking write
+SD_WRITE_FRAMES = 4096
+
+
+def _play_with_sounddevice(data, samplerate: int, stop_event: threading.Event) -> None:
+    """Play decoded audio with blocking writes (run on a playback thread).
+    
+    A blocking OutputStream keeps Python off PortAudio's real-time thread,
+    unlike sd.play(), whose stream callback needs the GIL for every block.
+    """
+    if data.ndim == 1:
+        data = data.reshape(-1, 1)
+    try:
+        with sd.OutputStream(
+            samplerate=samplerate,
+            channels=data.shape[1],
+            dtype=data.dtype,
+            blocksize=2048,
+            latency="high"
+        ) as stream:
+            for start in range(0, len(data), SD_WRITE_FRAMES):
+                if stop_event.is_set():
+                    break
+                stream.write(data[start:start + SD_WRITE_FRAMES])
+        logger.info("✅ Audio playback finished (sounddevice)")
     except Exception as e:
-        logger.error(f"❌ pyaudio failed: {e}")
+        logger.error(f"❌ sounddevice playback failed: {e}")
+
+
+def _start_sounddevice_playback(audio_bytes: bytes) -> None:
+    """Decode a clip and play it on a sounddevice thread, replacing any current one."""
+    global _sd_playback_stop
+    data, samplerate = sf.read(io.BytesIO(audio_bytes), dtype='int16')
+    logger.debug("📊 Audio data shape: %s, sample rate: %s", data.shape, samplerate)
+    # Cut off any clip that is still playing, then start this one
+    if _sd_playback_stop is not None:
+        _sd_playback_stop.set()
+    _sd_playback_stop = threading.Event()
+    threading.Thread(
+        target=_play_with_sounddevice,
+        args=(data, samplerate, _sd_playback_stop),
+        name="sounddevice-playback",
+        daemon=True
+    ).start()
+    logger.info("▶️ Audio playback started (sounddevice)")
+
+
+def _start_pygame_playback(audio_bytes: bytes) -> None:
+    """Play a clip on the pygame mixer, replacing any current one."""
+    # Decode once into a Sound rather than streaming through mixer.music
+    sound = pygame.mixer.Sound(file=io.BytesIO(audio_bytes))
+    pygame.mixer.stop()
+    sound.play()
+    logger.info("▶️ Audio playback started (pygame)")
+
+
+def _start_pyaudio_playback(audio_bytes: bytes) -> None:
+    """Play a clip through PyAudio (its write blocks, so it gets its own thread)."""
+    threading.Thread(
+        target=_play_with_pyaudio, args=(audio_bytes,), name="pyaudio-playback", daemon=True
+    ).start()
+
+
+# Backend name -> (initialiser, playback starter), in order of preference
+# when the "audio_backend" setting is "auto"
+AUDIO_BACKENDS = {
+    "sounddevice": (_init_sounddevice, _start_sounddevice_playback),
+    "pygame": (_init_pygame, _start_pygame_playback),
+    "pyaudio": (_init_pyaudio, _start_pyaudio_playback),
+}
+
+# Playback function picked once by _load_audio_backends (None: no audio)
+_play_impl: Optional[Callable[[bytes], None]] = None
+
+
+def play_audio(audio_bytes: bytes) -> None:
+    """Start playing WAV audio held in memory with the selected backend.
+    
+    Playback runs in the background so the hotkey worker is free again as
+    soon as it starts; a new clip interrupts one that is still playing.
+    """
+    # Check feature flag for TTS
+    if not get_config().get_feature("use_tts"):
+        logger.info("🔇 TTS disabled by feature flag - skipping playback")
+        return
+    
+    logger.info("📊 Audio size: %s bytes", len(audio_bytes))
     
-    logger.error(f"🔇 All audio libraries failed. Audio saved to: {audio_path}")
+    try:
+        _load_audio_backends()
+        if _play_impl is None:
+            logger.warning("🔇 No audio library available - skipping playback")
+            return
+        _play_impl(audio_bytes)
+    except Exception as e:
+        # Playback is best effort: the analysis has already been shown
+        logger.error(f"❌ Audio playback failed: {e}")
 
 
 def capture_screenshot_and_record_voice_claude():
@@ -181,20 +577,13 @@ def _claude_analysis_main(overlay, recorder, config):
         # Step 1: Capture screenshot
         logger.info("📸 Capturing screenshot...")
         try:
-            screenshot = ImageGrab.grab()
-            logger.info(f"📸 Screenshot captured: {screenshot.size} pixels")
+            screenshot = capture_screenshot()
+            logger.info("📸 Screenshot captured: %s pixels", screenshot.size)
         except Exception as e:
             logger.error(f"❌ Screenshot capture failed: {e}")
             overlay.display_error(f"Screenshot capture failed: {e}")
             return
         
-        # Save screenshot to buffer
-        screenshot_buffer = io.BytesIO()
-        screenshot.save(screenshot_buffer, format="PNG")
-        screenshot_buffer.seek(0)
-        screenshot_size = len(screenshot_buffer.getvalue())
-        logger.info(f"📸 Screenshot saved to buffer: {screenshot_size} bytes")
-        
         # Step 2: Start voice recording
         logger.info("🎤 Starting voice recording (speak after the chime, it will auto-stop when you're done)...")
         print("🎤 Recording started! Speak after the chime. Recording will auto-stop after silence.")
@@ -206,23 +595,20 @@ def _claude_analysis_main(overlay, recorder, config):
             overlay.display_error("Voice recording failed. Please check your microphone.")
             return
         
+        # Encode the screenshot while the user is speaking, so it costs
+        # nothing on the path from end of speech to the upload
+        screenshot_buffer = encode_during_recording(screenshot, recorder)
+        screenshot_size = screenshot_buffer.getbuffer().nbytes
+        logger.info("📸 Screenshot saved to buffer: %s bytes", screenshot_size)
+        
         # Wait for recording to complete (it will auto-stop on silence)
         print("🎤 Recording... (speak for at least 1 second, then auto-stops after 2 seconds of silence)")
-        wait_start_time = time.time()
         max_wait_time = 35.0  # Maximum time to wait for recording to complete
         
-        while recorder.is_recording_active():
-            # Check if auto-stop was triggered
-            if recorder.stop_event.is_set():
-                break
-            
-            # Check for timeout
-            if time.time() - wait_start_time > max_wait_time:
-                logger.warning("⚠️ Recording wait timeout - forcing stop")
-                recorder.stop_event.set()
-                break
-                
-            time.sleep(0.1)
+        # Sleep until the recorder signals a stop instead of polling it
+        if not recorder.wait_for_stop(timeout=max_wait_time):
+            logger.warning("⚠️ Recording wait timeout - forcing stop")
+            recorder.stop_event.set()
         
         # Get recorded audio (stop_recording will handle the cleanup)
         audio_bytes = recorder.stop_recording()
@@ -232,18 +618,14 @@ def _claude_analysis_main(overlay, recorder, config):
             overlay.display_error("No voice recorded. Please speak louder or check your microphone.")
             return
         
-        logger.info(f"🎵 Voice recorded: {len(audio_bytes)} bytes")
+        logger.info("🎵 Voice recorded: %s bytes", len(audio_bytes))
         print(f"✅ Voice recording completed: {len(audio_bytes)} bytes")
         
         # Step 3: First transcribe the audio to get the question text
         logger.info("🎤 Transcribing voice to text...")
         try:
             # Call transcription endpoint first
-            transcribe_response = requests.post(
-                "http://localhost:8000/api/v1/stt/transcribe",
-                files={"audio": ("voice.wav", io.BytesIO(audio_bytes), "audio/wav")},
-                timeout=30
-            )
+            transcribe_response = post_to_server("stt/transcribe", audio_bytes=audio_bytes, timeout=30)
             
             if transcribe_response.status_code != 200:
                 logger.error(f"❌ Transcription failed: {transcribe_response.status_code}")
@@ -252,7 +634,7 @@ def _claude_analysis_main(overlay, recorder, config):
                 
             transcription_result = transcribe_response.json()
             user_question = transcription_result.get('transcription', '').strip()
-            logger.info(f"📝 Transcribed question: '{user_question}'")
+            logger.info("📝 Transcribed question: '%s'", user_question)
             
             # Check if transcription is empty
             if not user_question:
@@ -280,40 +662,34 @@ def _claude_analysis_main(overlay, recorder, config):
         
         if use_tts:
             # Call the voice endpoint that returns audio
-            screenshot_buffer.seek(0)
-            files = {
-                "image": ("screenshot.png", screenshot_buffer, "image/png"),
-                "audio": ("voice.wav", io.BytesIO(audio_bytes), "audio/wav")
-            }
             data = {
                 "system_prompt": system_prompt,
                 "model": default_model
             }
             
-            response = requests.post(
-                "http://localhost:8000/api/v1/claude/analyze-game-with-voice",
-                files=files,
+            response = post_to_server(
+                "claude/analyze-game-with-voice",
+                screenshot=screenshot_buffer,
+                audio_bytes=audio_bytes,
                 data=data,
                 timeout=120
             )
         else:
             # TTS disabled - only get text response
-            screenshot_buffer.seek(0)
-            files = {"image": ("screenshot.png", screenshot_buffer, "image/png")}
             data = {
                 "question": user_question,
                 "system_prompt": system_prompt,
                 "model": default_model
             }
             
-            response = requests.post(
-                "http://localhost:8000/api/v1/claude/analyze-game-text-only",
-                files=files,
+            response = post_to_server(
+                "claude/analyze-game-text-only",
+                screenshot=screenshot_buffer,
                 data=data,
                 timeout=120
             )
         
-        logger.info(f"📡 Server response status: {response.status_code}")
+        logger.info("📡 Server response status: %s", response.status_code)
         
         if response.status_code == 200:
             if use_tts:
@@ -321,37 +697,24 @@ def _claude_analysis_main(overlay, recorder, config):
                 logger.info("✅ Claude analysis complete! Processing audio response...")
                 print("✅ Analysis complete! Response will be shown in overlay and played as audio.")
                 
-                # Save audio response
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-                    tmp_file.write(response.content)
-                    audio_path = tmp_file.name
-                
-                logger.info(f"💾 Audio response saved: {audio_path}")
-                
-                # Also get text for overlay (make text-only call)
-                screenshot_buffer.seek(0)
-                text_response = requests.post(
-                    "http://localhost:8000/api/v1/claude/analyze-game-text-only",
-                    files={"image": ("screenshot.png", screenshot_buffer, "image/png")},
-                    data={"question": user_question, "system_prompt": system_prompt, "model": default_model},
-                    timeout=60
-                )
-                
-                if text_response.status_code == 200:
-                    text_result = text_response.json()
-                    ai_text = text_result.get('response', 'Analysis completed.')
-                    overlay.display_response(ai_text)
-                else:
-                    overlay.display_response("Analysis completed. Audio response is ready.")
+                # The answer text comes back in a header alongside the audio;
+                # only older servers need a separate text-only call for it
+                ai_text = response_text(response)
+                if ai_text is None:
+                    text_response = post_to_server(
+                        "claude/analyze-game-text-only",
+                        screenshot=screenshot_buffer,
+                        data={"question": user_question, "system_prompt": system_prompt, "model": default_model},
+                        timeout=60
+                    )
+                    if text_response.status_code == 200:
+                        ai_text = text_response.json().get('response', 'Analysis completed.')
+                    else:
+                        ai_text = "Analysis completed. Audio response is ready."
+                overlay.display_response(ai_text)
                 
                 # Play audio
-                play_audio(audio_path)
-                
-                # Clean up audio file
-                try:
-                    os.unlink(audio_path)
-                except Exception as e:
-                    logger.warning(f"⚠️ Failed to clean up audio: {e}")
+                play_audio(response.content)
             else:
                 # Handle text-only response
                 logger.info("✅ Claude analysis complete!")
@@ -360,7 +723,7 @@ def _claude_analysis_main(overlay, recorder, config):
                 result = response.json()
                 ai_text = result.get('response', 'Analysis completed.')
                 model_used = result.get('model', default_model)
-                logger.info(f"🤖 Claude response ({model_used}): {ai_text[:200]}...")
+                logger.info("🤖 Claude response (%s): %s...", model_used, ai_text[:200])
                 overlay.display_response(f"[{model_used}] {ai_text}")
         else:
             logger.error(f"❌ Request failed with status {response.status_code}")
@@ -390,63 +753,54 @@ def capture_and_analyze_with_speech() -> None:
         # Show processing status
         overlay.set_processing_status()
         
-        screenshot = ImageGrab.grab()
-        logger.info(f"📸 Screenshot captured: {screenshot.size} pixels")
+        screenshot = capture_screenshot()
+        logger.info("📸 Screenshot captured: %s pixels", screenshot.size)
         
-        buffer = io.BytesIO()
-        screenshot.save(buffer, format="PNG")
-        buffer.seek(0)
-        image_size = len(buffer.getvalue())
-        logger.info(f"📸 Screenshot saved to buffer: {image_size} bytes")
+        buffer = capture_and_encode_screenshot(screenshot)
         
-        files = {"image": ("screenshot.png", buffer, "image/png")}
+        frame_hash = screenshot_digest(buffer)
+        cached = get_cached_analysis("game/analyze-and-speak", frame_hash)
+        if cached is not None:
+            logger.info("♻️ Screen unchanged - reusing previous analysis")
+            audio_bytes, description = cached
+            overlay.display_response(description)
+            if config.get_feature("use_tts"):
+                play_audio(audio_bytes)
+            return
         
         logger.info("🔍 Sending request to server for analysis and speech...")
-        response = requests.post(
-            "http://localhost:8000/api/v1/game/analyze-and-speak",
-            files=files,
+        response = post_to_server(
+            "game/analyze-and-speak",
+            screenshot=buffer,
             timeout=30,  # Increased timeout for AI processing
         )
         
-        logger.info(f"📡 Server response status: {response.status_code}")
-        logger.info(f"📡 Server response headers: {dict(response.headers)}")
-        logger.info(f"📡 Response content length: {len(response.content)} bytes")
+        logger.info("📡 Server response status: %s", response.status_code)
+        logger.debug("📡 Server response headers: %s", response.headers)
+        logger.info("📡 Response content length: %s bytes", len(response.content))
         
         if response.status_code == 200:
             logger.info("✅ Analysis complete!")
             
-            # Get the text description from server (need to make another call for JSON response)
-            buffer.seek(0)
-            text_response = requests.post(
-                "http://localhost:8000/api/v1/image/analyze",
-                files={"image": ("screenshot.png", buffer, "image/png")},
-                timeout=15
-            )
-            
-            description = "Game scene analyzed successfully."
-            if text_response.status_code == 200:
-                result = text_response.json()
-                description = result.get('description', description)
+            # The description comes back in a header alongside the audio;
+            # only older servers need a separate JSON call for it
+            description = response_text(response)
+            if description is None:
+                text_response = post_to_server("image/analyze", screenshot=buffer, timeout=15)
+                if text_response.status_code == 200:
+                    description = text_response.json().get('description')
+            if description is not None:
+                if not is_fallback_response(response):
+                    store_analysis("game/analyze-and-speak", frame_hash, (response.content, description))
+            else:
+                description = "Game scene analyzed successfully."
             
             # Display in overlay
             overlay.display_response(description)
             
             # Handle audio if TTS is enabled
             if config.get_feature("use_tts"):
-                # Save and play the audio response
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-                    tmp_file.write(response.content)
-                    audio_path = tmp_file.name
-                
-                logger.info(f"💾 Audio saved to temporary file: {audio_path}")
-                play_audio(audio_path)
-                
-                # Clean up temporary file
-                try:
-                    os.unlink(audio_path)
-                    logger.info("🧹 Temporary audio file cleaned up")
-                except Exception as e:
-                    logger.warning(f"⚠️ Failed to clean up temporary file: {e}")
+                play_audio(response.content)
             else:
                 logger.info("🔇 TTS disabled - showing text only")
                 print("✅ Analysis complete! Response displayed in overlay.")
@@ -473,32 +827,33 @@ def capture_and_analyze_text_only() -> None:
     try:
         # Show processing status
         overlay.set_processing_status()
-        screenshot = ImageGrab.grab()
-        logger.info(f"📸 Screenshot captured: {screenshot.size} pixels")
+        screenshot = capture_screenshot()
+        logger.info("📸 Screenshot captured: %s pixels", screenshot.size)
         
-        buffer = io.BytesIO()
-        screenshot.save(buffer, format="PNG")
-        buffer.seek(0)
-        image_size = len(buffer.getvalue())
-        logger.info(f"📸 Screenshot saved to buffer: {image_size} bytes")
+        buffer = capture_and_encode_screenshot(screenshot)
         
-        files = {"image": ("screenshot.png", buffer, "image/png")}
+        frame_hash = screenshot_digest(buffer)
+        description = get_cached_analysis("image/analyze", frame_hash)
+        if description is not None:
+            logger.info("♻️ Screen unchanged - reusing previous analysis")
+            overlay.display_response(description)
+            return
         
         logger.info("🔍 Sending request to server for text analysis...")
-        response = requests.post(
-            "http://localhost:8000/api/v1/image/analyze",
-            files=files,
-            timeout=15,
-        )
+        response = post_to_server("image/analyze", screenshot=buffer, timeout=15)
         
-        logger.info(f"📡 Server response status: {response.status_code}")
-        logger.info(f"📡 Response content length: {len(response.content)} bytes")
+        logger.info("📡 Server response status: %s", response.status_code)
+        logger.info("📡 Response content length: %s bytes", len(response.content))
         
         if response.status_code == 200:
             result = response.json()
-            description = result.get('description', 'No description available')
-            logger.info(f"📝 Server response JSON: {result}")
-            logger.info(f"📝 Description: {description}")
+            description = result.get('description')
+            logger.debug("📝 Server response JSON: %s", result)
+            logger.info("📝 Description: %s", description)
+            if description is not None:
+                store_analysis("image/analyze", frame_hash, description)
+            else:
+                description = 'No description available'
             
             # Display in overlay
             overlay.display_response(description)
@@ -536,20 +891,13 @@ def capture_screenshot_and_record_voice() -> None:
         # Step 1: Capture screenshot
         logger.info("📸 Capturing screenshot...")
         try:
-            screenshot = ImageGrab.grab()
-            logger.info(f"📸 Screenshot captured: {screenshot.size} pixels")
+            screenshot = capture_screenshot()
+            logger.info("📸 Screenshot captured: %s pixels", screenshot.size)
         except Exception as e:
             logger.error(f"❌ Screenshot capture failed: {e}")
             overlay.display_error(f"Screenshot capture failed: {e}")
             return
         
-        # Save screenshot to buffer
-        screenshot_buffer = io.BytesIO()
-        screenshot.save(screenshot_buffer, format="PNG")
-        screenshot_buffer.seek(0)
-        screenshot_size = len(screenshot_buffer.getvalue())
-        logger.info(f"📸 Screenshot saved to buffer: {screenshot_size} bytes")
-        
         # Step 2: Start voice recording
         logger.info("🎤 Starting voice recording (speak after the chime, it will auto-stop when you're done)...")
         print("🎤 Recording started! Speak after the chime. Recording will auto-stop after silence.")
@@ -563,19 +911,20 @@ def capture_screenshot_and_record_voice() -> None:
             capture_and_analyze_with_speech()
             return
         
+        # Encode the screenshot while the user is speaking, so it costs
+        # nothing on the path from end of speech to the upload
+        screenshot_buffer = encode_during_recording(screenshot, recorder)
+        screenshot_size = screenshot_buffer.getbuffer().nbytes
+        logger.info("📸 Screenshot saved to buffer: %s bytes", screenshot_size)
+        
         # Wait for recording to complete (it will auto-stop on silence)
         print("🎤 Recording... (speak for at least 1 second, then auto-stops after 2 seconds of silence)")
-        wait_start_time = time.time()
         max_wait_time = 35.0  # Maximum time to wait for recording to complete
         
-        while recorder.is_recording_active():
-            # Check for timeout
-            if time.time() - wait_start_time > max_wait_time:
-                logger.warning("⚠️ Recording wait timeout - forcing stop")
-                recorder.stop_event.set()
-                break
-                
-            time.sleep(0.1)
+        # Sleep until the recorder signals a stop instead of polling it
+        if not recorder.wait_for_stop(timeout=max_wait_time):
+            logger.warning("⚠️ Recording wait timeout - forcing stop")
+            recorder.stop_event.set()
         
         # Get recorded audio
         audio_bytes = recorder.stop_recording()
@@ -587,7 +936,7 @@ def capture_screenshot_and_record_voice() -> None:
             capture_and_analyze_with_speech()
             return
         
-        logger.info(f"🎵 Voice recorded: {len(audio_bytes)} bytes")
+        logger.info("🎵 Voice recorded: %s bytes", len(audio_bytes))
         print(f"✅ Voice recording completed: {len(audio_bytes)} bytes")
         
         # Step 3: Send both to OpenAI server
@@ -602,55 +951,38 @@ def capture_screenshot_and_record_voice() -> None:
         else:
             openai_model = default_model
         
-        # Prepare files for upload with system prompt
-        screenshot_buffer.seek(0)
-        files = {
-            "image": ("screenshot.png", screenshot_buffer, "image/png"),
-            "audio": ("voice.wav", io.BytesIO(audio_bytes), "audio/wav")
-        }
+        # Prepare form fields with system prompt
         data = {
             "system_prompt": "You are a helpful game assistant. Analyze the screenshot and answer the user's question about the game situation. Provide specific, actionable advice for the player."
         }
         if openai_model:
             data["model"] = openai_model
         
-        response = requests.post(
-            "http://localhost:8000/api/v1/openai/analyze-game-with-voice",
-            files=files,
+        response = post_to_server(
+            "openai/analyze-game-with-voice",
+            screenshot=screenshot_buffer,
+            audio_bytes=audio_bytes,
             data=data,
             timeout=120,  # Longer timeout for OpenAI processing
         )
         
-        logger.info(f"📡 Server response status: {response.status_code}")
-        logger.info(f"📡 Server response headers: {dict(response.headers)}")
-        logger.info(f"📡 Response content length: {len(response.content)} bytes")
+        logger.info("📡 Server response status: %s", response.status_code)
+        logger.debug("📡 Server response headers: %s", response.headers)
+        logger.info("📡 Response content length: %s bytes", len(response.content))
         
         if response.status_code == 200:
             logger.info("✅ Combined analysis complete!")
             
-            # Display a message in the overlay (OpenAI returns audio, not text)
-            overlay.display_response("Analysis complete! OpenAI has generated a response.")
+            # Display the answer text the server sent alongside the audio
+            ai_text = response_text(response)
+            overlay.display_response(ai_text or "Analysis complete! OpenAI has generated a response.")
             
             # Handle audio if TTS is enabled
             if config.get_feature("use_tts"):
                 print("✅ Analysis complete! Playing AI response...")
                 
-                # Save and play the audio response
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-                    tmp_file.write(response.content)
-                    audio_path = tmp_file.name
-                
-                logger.info(f"💾 Response audio saved to temporary file: {audio_path}")
-                
                 # Use our improved audio playback function
-                play_audio(audio_path)
-                
-                # Clean up temporary file
-                try:
-                    os.unlink(audio_path)
-                    logger.info("🧹 Temporary audio file cleaned up")
-                except Exception as e:
-                    logger.warning(f"⚠️ Failed to clean up temporary file: {e}")
+                play_audio(response.content)
             else:
                 logger.info("🔇 TTS disabled - OpenAI response received but not played")
                 print("✅ Analysis complete! (TTS disabled - check logs for details)")
@@ -670,41 +1002,32 @@ def capture_screenshot_and_record_voice() -> None:
         overlay.display_error(f"Unexpected error: {exc}")
 
 
+# The TTS test request never changes, so its JSON body is encoded once
+TTS_TEST_TEXT = "Hello! This is a test of the text-to-speech service."
+_TTS_TEST_BODY = json.dumps({"text": TTS_TEST_TEXT, "language": "en"}).encode("utf-8")
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
 def test_tts_service() -> None:
     """Test the TTS service with a sample text."""
-    test_text = "Hello! This is a test of the text-to-speech service."
-    
     try:
-        logger.info(f"🔊 Testing TTS with: '{test_text}'")
-        response = requests.post(
-            "http://localhost:8000/api/v1/tts/speak",
-            json={"text": test_text, "language": "en"},
+        logger.info("🔊 Testing TTS with: '%s'", TTS_TEST_TEXT)
+        response = _session.post(
+            f"{API_BASE_URL}/tts/speak",
+            data=_TTS_TEST_BODY,
+            headers=_JSON_HEADERS,
             timeout=15,
         )
         
-        logger.info(f"📡 TTS response status: {response.status_code}")
-        logger.info(f"📡 TTS response headers: {dict(response.headers)}")
-        logger.info(f"📡 TTS response content length: {len(response.content)} bytes")
+        logger.info("📡 TTS response status: %s", response.status_code)
+        logger.debug("📡 TTS response headers: %s", response.headers)
+        logger.info("📡 TTS response content length: %s bytes", len(response.content))
         
         if response.status_code == 200:
             logger.info("✅ TTS generation successful! Processing audio...")
             
-            # Save and play the audio response
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-                tmp_file.write(response.content)
-                audio_path = tmp_file.name
-            
-            logger.info(f"💾 TTS audio saved to temporary file: {audio_path}")
-            
             # Use our improved audio playback function
-            play_audio(audio_path)
-            
-            # Clean up
-            try:
-                os.unlink(audio_path)
-                logger.info("🧹 Temporary TTS audio file cleaned up")
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to clean up temporary TTS file: {e}")
+            play_audio(response.content)
         else:
             logger.error(f"❌ TTS test failed with status {response.status_code}")
             logger.error(f"❌ TTS response text: {response.text}")
@@ -722,6 +1045,11 @@ def main() -> None:
     # Initialize Tkinter root window early
     root = get_root()
     
+    # Build the overlay and recorder now so the first hotkey press does not pay
+    # for the capture buffer, feedback sounds and sound worker start-up
+    get_overlay()
+    get_voice_recorder()
+    
     # Get config to show current settings
     config = get_config()
     tts_status = "enabled" if config.get_feature("use_tts") else "disabled"
@@ -739,7 +1067,7 @@ def main() -> None:
     print("Phase 1 Features:")
     print("  - Voice questions are transcribed and analyzed")
     print("  - AI responses shown in transparent overlay window")
-    print("  - Audio responses saved but not played (TTS disabled)")
+    print("  - Audio responses played from memory when TTS is enabled")
     print("  - All responses logged to console and files")
     print()
     print("RECOMMENDED: Use Ctrl+Shift+C for Claude-powered analysis!")
@@ -747,41 +1075,34 @@ def main() -> None:
     print()
     
     # Register hotkeys for new functionality
-    keyboard.add_hotkey("ctrl+shift+c", capture_screenshot_and_record_voice_claude)  # NEW Claude with overlay
-    keyboard.add_hotkey("ctrl+shift+v", capture_screenshot_and_record_voice)         # OpenAI combined function
-    keyboard.add_hotkey("ctrl+shift+s", capture_and_analyze_with_speech)             # Existing screenshot + TTS
-    keyboard.add_hotkey("ctrl+shift+a", capture_and_analyze_text_only)               # Existing screenshot only
-    keyboard.add_hotkey("ctrl+shift+t", test_tts_service)                            # Existing TTS test
-    
-    # Flag to control main loop
-    running = True
+    keyboard.add_hotkey("ctrl+shift+c", run_hotkey_action, args=(capture_screenshot_and_record_voice_claude,))  # NEW Claude with overlay
+    keyboard.add_hotkey("ctrl+shift+v", run_hotkey_action, args=(capture_screenshot_and_record_voice,))         # OpenAI combined function
+    keyboard.add_hotkey("ctrl+shift+s", run_hotkey_action, args=(capture_and_analyze_with_speech,))             # Existing screenshot + TTS
+    keyboard.add_hotkey("ctrl+shift+a", run_hotkey_action, args=(capture_and_analyze_text_only,))               # Existing screenshot only
+    keyboard.add_hotkey("ctrl+shift+t", run_hotkey_action, args=(test_tts_service,))                            # Existing TTS test
     
     def quit_app():
-        nonlocal running
-        running = False
-        root.quit()
+        # Called on the keyboard hook thread; Tk must be stopped from its own
+        run_on_ui_thread(root.quit)
     
     keyboard.add_hotkey("esc", quit_app)
     
     logger.info("Client ready! Use the hotkeys above or press Esc to quit.")
     print("Client ready! Use the hotkeys above or press Esc to quit.")
     
-    # Run Tkinter event loop with periodic updates
-    while running:
+    # Block in Tk's own event loop: it sleeps until there is something to
+    # handle instead of being polled a hundred times a second
+    while True:
         try:
-            root.update()
-            # Use root.after instead of time.sleep to avoid KeyboardInterrupt issues
-            root.update_idletasks()
-            time.sleep(0.01)  # Small delay to prevent high CPU usage
+            root.mainloop()
+            break
         except KeyboardInterrupt:
             # Handle Ctrl+C gracefully - but continue running for hotkeys
             logger.info("KeyboardInterrupt caught in main loop - continuing...")
-            continue
-        except Exception as e:
-            logger.error(f"Error in main loop: {e}")
-            break
     
     logger.info("Client shutting down...")
+    _hotkey_executor.shutdown(wait=False, cancel_futures=True)
+    _session.close()
     print("Goodbye!")
 
 
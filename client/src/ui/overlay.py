@@ -1,15 +1,27 @@
 """Sci-fi transparent overlay UI for displaying AI responses."""
 
+import logging
 import tkinter as tk
+from tkinter import font as tkfont
 from tkinter import scrolledtext
 import threading
 import time
 import queue
 
+logger = logging.getLogger(__name__)
+
 # Global root window for proper Tkinter initialization
 _root = None
 _command_queue = queue.Queue()
 
+# Queue poll interval: drops to the minimum while commands are arriving and
+# backs off geometrically while the queue stays empty. Producers also wake
+# the loop directly with a virtual event, so the poll is only a fallback.
+_QUEUE_POLL_MIN_MS = 1
+_QUEUE_POLL_MAX_MS = 50
+_queue_poll_ms = _QUEUE_POLL_MIN_MS
+_queue_poll_job = None
+
 def get_root():
     """Get or create the global Tkinter root window."""
     global _root
@@ -17,24 +29,58 @@ def get_root():
         _root = tk.Tk()
         _root.withdraw()  # Hide the root window
         _root.title("AI Gaming Assistant Root")
+        _root.bind("<<CmdQueued>>", _process_queue)
         # Start processing commands from other threads
         _process_queue()
     return _root
 
-def _process_queue():
+def run_on_ui_thread(command, *args):
+    """Queue a call to run on the Tkinter main thread."""
+    _command_queue.put((command, args))
+    if _root is not None:
+        try:
+            _root.event_generate("<<CmdQueued>>", when="tail")
+        except (RuntimeError, tk.TclError):
+            pass  # Non-threaded Tcl or loop not running: the poll picks it up
+
+def _process_queue(event=None):
     """Process commands from the queue on the main thread."""
-    try:
-        while True:
-            try:
-                command, args = _command_queue.get_nowait()
-                command(*args)
-            except queue.Empty:
-                break
-    except:
-        pass
-    # Schedule next check
+    global _queue_poll_ms, _queue_poll_job
+    handled = False
+    while True:
+        try:
+            command, args = _command_queue.get_nowait()
+        except queue.Empty:
+            break
+        handled = True
+        try:
+            command(*args)
+        except Exception:
+            logger.exception("❌ UI command failed")
+    
+    if handled:
+        _queue_poll_ms = _QUEUE_POLL_MIN_MS
+    else:
+        _queue_poll_ms = min(_queue_poll_ms * 2, _QUEUE_POLL_MAX_MS)
+    
+    # Schedule next check, replacing the pending one when woken by an event
     if _root:
-        _root.after(10, _process_queue)
+        if _queue_poll_job is not None:
+            _root.after_cancel(_queue_poll_job)
+        _queue_poll_job = _root.after(_queue_poll_ms, _process_queue)
+
+
+# Title box drawn above the response text
+TITLE_TEXT = "╔══ AI GAMING ASSISTANT ══╗"
+SEPARATOR_TEXT = "╚═════════════════════════╝"
+
+# Placeholder shown while a request is being processed
+PROCESSING_TEXT = (
+    "🤖 Processing your request...\n\n"
+    "⚡ Analyzing screenshot\n"
+    "🎤 Transcribing voice\n"
+    "🧠 Generating response\n"
+)
 
 
 class SciFiOverlay:
@@ -58,10 +104,22 @@ class SciFiOverlay:
         """Create the overlay window with sci-fi aesthetics."""
         if self.window is not None:
             return
+        # Widgets must only ever be built on the Tk thread
+        if threading.current_thread() is not threading.main_thread():
+            logger.warning("⚠️ create_window called off the Tk thread - re-queueing")
+            run_on_ui_thread(self.create_window)
+            return
             
         # Ensure root window exists
         root = get_root()
         
+        # Named fonts are resolved by Tk once and shared by every widget
+        self.title_font = tkfont.Font(root, family="Consolas", size=10, weight="bold")
+        self.status_font = tkfont.Font(root, family="Consolas", size=8)
+        self.body_font = tkfont.Font(root, family="Consolas", size=9)
+        self.header_font = tkfont.Font(root, family="Consolas", size=9, weight="bold")
+        self.button_font = tkfont.Font(root, family="Consolas", size=8, weight="bold")
+        
         # Create the main window
         self.window = tk.Toplevel(root)
         self.window.title("AI Gaming Assistant")
@@ -89,10 +147,10 @@ class SciFiOverlay:
         
         title_label = tk.Label(
             title_frame,
-            text="╔══ AI GAMING ASSISTANT ══╗",
+            text=TITLE_TEXT,
             bg=self.bg_color,
             fg=self.accent_color,
-            font=("Consolas", 10, "bold")
+            font=self.title_font
         )
         title_label.pack()
         
@@ -102,17 +160,17 @@ class SciFiOverlay:
             text="║ Status: Ready           ║",
             bg=self.bg_color,
             fg=self.fg_color,
-            font=("Consolas", 8)
+            font=self.status_font
         )
         self.status_label.pack()
         
         # Separator
         separator_label = tk.Label(
             title_frame,
-            text="╚═════════════════════════╝",
+            text=SEPARATOR_TEXT,
             bg=self.bg_color,
             fg=self.accent_color,
-            font=("Consolas", 10, "bold")
+            font=self.title_font
         )
         separator_label.pack()
         
@@ -127,7 +185,7 @@ class SciFiOverlay:
             insertbackground=self.accent_color,
             selectbackground=self.accent_color,
             selectforeground=self.bg_color,
-            font=("Consolas", 9),
+            font=self.body_font,
             wrap=tk.WORD,
             relief="flat",
             highlightthickness=1,
@@ -136,6 +194,10 @@ class SciFiOverlay:
         )
         self.text_widget.pack(fill="both", expand=True)
         
+        # Configure text tags for styling once, not on every message
+        self.text_widget.tag_config("header", foreground=self.accent_color, font=self.header_font)
+        self.text_widget.tag_config("error_header", foreground=self.warning_color, font=self.header_font)
+        
         # Control buttons frame
         button_frame = tk.Frame(main_frame, bg=self.bg_color)
         button_frame.pack(fill="x", pady=5)
@@ -146,7 +208,7 @@ class SciFiOverlay:
             text="✕ Close",
             bg=self.warning_color,
             fg=self.bg_color,
-            font=("Consolas", 8, "bold"),
+            font=self.button_font,
             relief="flat",
             command=self.hide_window,
             cursor="hand2"
@@ -159,7 +221,7 @@ class SciFiOverlay:
             text="○ Clear",
             bg=self.border_color,
             fg=self.fg_color,
-            font=("Consolas", 8, "bold"),
+            font=self.button_font,
             relief="flat",
             command=self.clear_text,
             cursor="hand2"
@@ -184,7 +246,7 @@ class SciFiOverlay:
             self.is_visible = True
         
         # Queue the command for main thread
-        _command_queue.put((_show_window_main_thread, ()))
+        run_on_ui_thread(_show_window_main_thread)
         
     def hide_window(self):
         """Hide the overlay window."""
@@ -208,7 +270,7 @@ class SciFiOverlay:
             self.status_label.config(text=formatted_status, fg=color_to_use)
         
         # Queue the command for main thread
-        _command_queue.put((_update_status_main_thread, ()))
+        run_on_ui_thread(_update_status_main_thread)
         
     def display_response(self, response: str, show_window: bool = True):
         """Display AI response in the overlay."""
@@ -219,18 +281,12 @@ class SciFiOverlay:
             if self.text_widget is None:
                 return
                 
-            # Clear previous content
-            self.text_widget.delete(1.0, tk.END)
-            
             # Add timestamp header
             timestamp = time.strftime("%H:%M:%S")
             header = f"[{timestamp}] AI Response:\n" + "─" * 30 + "\n\n"
             
-            self.text_widget.insert(tk.END, header, "header")
-            self.text_widget.insert(tk.END, response)
-            
-            # Configure text tags for styling
-            self.text_widget.tag_config("header", foreground=self.accent_color, font=("Consolas", 9, "bold"))
+            # Swap out the previous content in a single Tcl call
+            self.text_widget.replace(1.0, tk.END, header, "header", response)
             
             # Auto-scroll to top
             self.text_widget.see(1.0)
@@ -239,7 +295,7 @@ class SciFiOverlay:
             self.update_status("Response Ready", self.success_color)
         
         # Queue the command for main thread
-        _command_queue.put((_display_response_main_thread, ()))
+        run_on_ui_thread(_display_response_main_thread)
         
     def display_error(self, error: str):
         """Display error message in the overlay."""
@@ -249,18 +305,12 @@ class SciFiOverlay:
             if self.text_widget is None:
                 return
                 
-            # Clear previous content
-            self.text_widget.delete(1.0, tk.END)
-            
             # Add error header
             timestamp = time.strftime("%H:%M:%S")
             header = f"[{timestamp}] ERROR:\n" + "─" * 30 + "\n\n"
             
-            self.text_widget.insert(tk.END, header, "error_header")
-            self.text_widget.insert(tk.END, error)
-            
-            # Configure error styling
-            self.text_widget.tag_config("error_header", foreground=self.warning_color, font=("Consolas", 9, "bold"))
+            # Swap out the previous content in a single Tcl call
+            self.text_widget.replace(1.0, tk.END, header, "error_header", error)
             
             # Auto-scroll to top
             self.text_widget.see(1.0)
@@ -269,7 +319,7 @@ class SciFiOverlay:
             self.update_status("Error", self.warning_color)
         
         # Queue the command for main thread
-        _command_queue.put((_display_error_main_thread, ()))
+        run_on_ui_thread(_display_error_main_thread)
         
     def clear_text(self):
         """Clear the text display."""
@@ -281,17 +331,13 @@ class SciFiOverlay:
         """Show processing status with animation."""
         def _set_processing_status_main_thread():
             if self.text_widget is not None:
-                self.text_widget.delete(1.0, tk.END)
-                self.text_widget.insert(tk.END, "🤖 Processing your request...\n\n")
-                self.text_widget.insert(tk.END, "⚡ Analyzing screenshot\n")
-                self.text_widget.insert(tk.END, "🎤 Transcribing voice\n") 
-                self.text_widget.insert(tk.END, "🧠 Generating response\n")
+                self.text_widget.replace(1.0, tk.END, PROCESSING_TEXT)
             
             self.update_status("Processing...", self.accent_color)
             self.show_window()
         
         # Queue the command for main thread
-        _command_queue.put((_set_processing_status_main_thread, ()))
+        run_on_ui_thread(_set_processing_status_main_thread)
 
 
 # Global overlay instance
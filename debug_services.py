@@ -1,49 +1,77 @@
 #!/usr/bin/env python3
 """Debug script to test the services directly."""
 
-import requests
+import argparse
 import io
-from PIL import Image, ImageDraw
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def test_dependencies():
-    """Test if required dependencies are available."""
-    print("🔍 Testing dependencies...")
-    
-    # Test transformers
+import requests
+
+API_BASE_URL = "http://localhost:8000/api/v1"
+
+# One session for all endpoint tests so they share a keep-alive connection
+SESSION = requests.Session()
+
+def _check_transformers():
+    """Import transformers and load the captioning model; return report lines."""
+    lines = []
     try:
         from transformers import pipeline
-        print("✅ transformers available")
+        lines.append("✅ transformers available")
         try:
             captioner = pipeline("image-to-text", model="nlpconnect/vit-gpt2-image-captioning")
-            print("✅ Image captioning model loaded successfully")
+            lines.append("✅ Image captioning model loaded successfully")
         except Exception as e:
-            print(f"❌ Image captioning model failed to load: {e}")
+            lines.append(f"❌ Image captioning model failed to load: {e}")
     except ImportError as e:
-        print(f"❌ transformers not available: {e}")
-    
-    # Test TTS
+        lines.append(f"❌ transformers not available: {e}")
+    return lines
+
+def _check_tts():
+    """Import Coqui TTS and load the XTTS model; return report lines."""
+    lines = []
     try:
         from TTS.api import TTS
-        print("✅ TTS available")
+        lines.append("✅ TTS available")
         try:
             tts = TTS(model_name="tts_models/multilingual/multi-dataset/xtts_v2", progress_bar=False, gpu=False)
-            print("✅ TTS model loaded successfully")
+            lines.append("✅ TTS model loaded successfully")
         except Exception as e:
-            print(f"❌ TTS model failed to load: {e}")
+            lines.append(f"❌ TTS model failed to load: {e}")
     except ImportError as e:
-        print(f"❌ TTS not available: {e}")
+        lines.append(f"❌ TTS not available: {e}")
+    return lines
 
-def create_test_image():
-    """Create a simple test image."""
-    img = Image.new('RGB', (300, 200), color='white')
-    draw = ImageDraw.Draw(img)
-    draw.rectangle([50, 50, 250, 150], fill='blue', outline='black')
-    draw.text((100, 100), "TEST IMAGE", fill='white')
+def test_dependencies():
+    """Test if required dependencies are available."""
+    print("🔍 Testing dependencies...")
     
-    buffer = io.BytesIO()
-    img.save(buffer, format='PNG')
-    buffer.seek(0)
-    return buffer
+    # Both checks spend most of their time importing and reading model
+    # weights, so run them side by side and print each report as it finishes
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(_check_transformers), executor.submit(_check_tts)]
+        for future in as_completed(futures):
+            print("\n".join(future.result()))
+
+# PNG bytes of the test image, rendered on first use and shared by every test
+_TEST_PNG_BYTES = None
+
+def create_test_image():
+    """Return a simple test image as a PNG buffer."""
+    global _TEST_PNG_BYTES
+    if _TEST_PNG_BYTES is None:
+        from PIL import Image, ImageDraw
+        
+        img = Image.new('RGB', (300, 200), color='white')
+        draw = ImageDraw.Draw(img)
+        draw.rectangle([50, 50, 250, 150], fill='blue', outline='black')
+        draw.text((100, 100), "TEST IMAGE", fill='white')
+        
+        buffer = io.BytesIO()
+        img.save(buffer, format='PNG')
+        _TEST_PNG_BYTES = buffer.getvalue()
+    return io.BytesIO(_TEST_PNG_BYTES)
 
 def test_image_analysis():
     """Test the image analysis endpoint."""
@@ -53,7 +81,7 @@ def test_image_analysis():
     files = {"image": ("test.png", test_image, "image/png")}
     
     try:
-        response = requests.post("http://localhost:8000/api/v1/image/analyze", files=files, timeout=30)
+        response = SESSION.post(f"{API_BASE_URL}/image/analyze", files=files, timeout=30)
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
             result = response.json()
@@ -63,6 +91,35 @@ def test_image_analysis():
     except Exception as e:
         print(f"Request failed: {e}")
 
+def _save_audio_response(response, path):
+    """Stream an audio response body to a file; return (bytes written, first 20 bytes)."""
+    written = 0
+    head = b""
+    with open(path, "wb") as f:
+        for chunk in response.iter_content(64 * 1024):
+            if len(head) < 20:
+                head += chunk[:20 - len(head)]
+            f.write(chunk)
+            written += len(chunk)
+    if written == 0:
+        os.remove(path)
+    return written, head
+
+def _report_wav(size, head, path, label):
+    """Print what was saved from an audio endpoint."""
+    print(f"Content-Length: {size} bytes")
+    if size > 0:
+        print(f"✅ {label} response saved to {path}")
+        
+        # Check WAV header
+        if head.startswith(b'RIFF'):
+            print("✅ Response appears to be a valid WAV file")
+        else:
+            print("❌ Response does not appear to be a valid WAV file")
+            print(f"First 20 bytes: {head}")
+    else:
+        print("❌ Empty response")
+
 def test_tts():
     """Test the TTS endpoint."""
     print("\n🔊 Testing TTS endpoint...")
@@ -70,28 +127,16 @@ def test_tts():
     test_data = {"text": "Hello, this is a test", "language": "en"}
     
     try:
-        response = requests.post("http://localhost:8000/api/v1/tts/speak", json=test_data, timeout=30)
-        print(f"Status: {response.status_code}")
-        print(f"Content-Type: {response.headers.get('content-type')}")
-        print(f"Content-Length: {len(response.content)} bytes")
-        
-        if response.status_code == 200:
-            if len(response.content) > 0:
-                # Save to file for inspection
-                with open("test_tts_output.wav", "wb") as f:
-                    f.write(response.content)
-                print("✅ TTS response saved to test_tts_output.wav")
-                
-                # Check WAV header
-                if response.content.startswith(b'RIFF'):
-                    print("✅ Response appears to be a valid WAV file")
-                else:
-                    print("❌ Response does not appear to be a valid WAV file")
-                    print(f"First 20 bytes: {response.content[:20]}")
+        # Stream the body straight to disk instead of holding it in memory
+        with SESSION.post(f"{API_BASE_URL}/tts/speak", json=test_data, timeout=30, stream=True) as response:
+            print(f"Status: {response.status_code}")
+            print(f"Content-Type: {response.headers.get('content-type')}")
+            
+            if response.status_code == 200:
+                size, head = _save_audio_response(response, "test_tts_output.wav")
+                _report_wav(size, head, "test_tts_output.wav", "TTS")
             else:
-                print("❌ Empty response")
-        else:
-            print(f"Error: {response.text}")
+                print(f"Error: {response.text}")
     except Exception as e:
         print(f"Request failed: {e}")
 
@@ -103,33 +148,38 @@ def test_combined_endpoint():
     files = {"image": ("test.png", test_image, "image/png")}
     
     try:
-        response = requests.post("http://localhost:8000/api/v1/game/analyze-and-speak", files=files, timeout=60)
-        print(f"Status: {response.status_code}")
-        print(f"Content-Type: {response.headers.get('content-type')}")
-        print(f"Content-Length: {len(response.content)} bytes")
-        
-        if response.status_code == 200:
-            if len(response.content) > 0:
-                with open("test_combined_output.wav", "wb") as f:
-                    f.write(response.content)
-                print("✅ Combined response saved to test_combined_output.wav")
-                
-                if response.content.startswith(b'RIFF'):
-                    print("✅ Response appears to be a valid WAV file")
-                else:
-                    print("❌ Response does not appear to be a valid WAV file")
-                    print(f"First 20 bytes: {response.content[:20]}")
+        with SESSION.post(f"{API_BASE_URL}/game/analyze-and-speak", files=files, timeout=60, stream=True) as response:
+            print(f"Status: {response.status_code}")
+            print(f"Content-Type: {response.headers.get('content-type')}")
+            
+            if response.status_code == 200:
+                size, head = _save_audio_response(response, "test_combined_output.wav")
+                _report_wav(size, head, "test_combined_output.wav", "Combined")
             else:
-                print("❌ Empty response")
-        else:
-            print(f"Error: {response.text}")
+                print(f"Error: {response.text}")
     except Exception as e:
         print(f"Request failed: {e}")
 
+# Diagnostics selectable with --only, in the order they run by default
+CHECKS = {
+    "dependencies": test_dependencies,
+    "image": test_image_analysis,
+    "tts": test_tts,
+    "combined": test_combined_endpoint,
+}
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=list(CHECKS),
+        help="run only this check (may be given more than once)"
+    )
+    args = parser.parse_args()
+    
     print("🐛 Starting service diagnostics...\n")
-    test_dependencies()
-    test_image_analysis()
-    test_tts()
-    test_combined_endpoint()
-    print("\n✅ Diagnostics complete!") 
\ No newline at end of file
+    for name, check in CHECKS.items():
+        if args.only is None or name in args.only:
+            check()
+    print("\n✅ Diagnostics complete!")
@@ -15,12 +15,36 @@ Requirements:
     - TTS library installed
 """
 
+import functools
 import sys
 import time
 from typing import Optional
 import os
 
 
+# CUDA queries go through the driver (and the first one initializes the CUDA
+# context), so each is asked once per run and shared by every check below
+@functools.lru_cache(maxsize=1)
+def _cuda_available() -> bool:
+    """Return torch.cuda.is_available(), queried once."""
+    import torch
+    return torch.cuda.is_available()
+
+
+@functools.lru_cache(maxsize=1)
+def _device_count() -> int:
+    """Return torch.cuda.device_count(), queried once."""
+    import torch
+    return torch.cuda.device_count()
+
+
+@functools.lru_cache(maxsize=None)
+def _device_properties(index: int):
+    """Return torch.cuda.get_device_properties(index), queried once per device."""
+    import torch
+    return torch.cuda.get_device_properties(index)
+
+
 def check_python_version() -> bool:
     """Check if Python version is suitable."""
     print("=== Python Version Check ===")
@@ -43,18 +67,17 @@ def check_torch_installation() -> bool:
         import torch
         print(f"PyTorch Version: {torch.__version__}")
         
-        cuda_available = torch.cuda.is_available()
+        cuda_available = _cuda_available()
         print(f"CUDA Available: {cuda_available}")
         
         if cuda_available:
             print(f"CUDA Version: {torch.version.cuda}")
-            device_count = torch.cuda.device_count()
+            device_count = _device_count()
             print(f"GPU Count: {device_count}")
             
             for i in range(device_count):
-                gpu_name = torch.cuda.get_device_name(i)
-                gpu_memory = torch.cuda.get_device_properties(i).total_memory / 1e9
-                print(f"GPU {i}: {gpu_name} ({gpu_memory:.1f} GB)")
+                props = _device_properties(i)
+                print(f"GPU {i}: {props.name} ({props.total_memory / 1e9:.1f} GB)")
             
             print("✅ CUDA setup is working!")
             return True
@@ -97,9 +120,8 @@ def test_tts_gpu_performance() -> Optional[float]:
         print("ℹ️  Applied TORCH_FORCE_NO_WEIGHTS_ONLY_LOAD=1 to allow older model format.")
 
         from TTS.api import TTS
-        import torch
         
-        if not torch.cuda.is_available():
+        if not _cuda_available():
             print("⚠️  Skipping GPU test - CUDA not available")
             return None
         
@@ -165,13 +187,13 @@ def check_memory_usage() -> None:
     try:
         import torch
         
-        if not torch.cuda.is_available():
+        if not _cuda_available():
             print("⚠️  CUDA not available - skipping memory check")
             return
         
-        for i in range(torch.cuda.device_count()):
+        for i in range(_device_count()):
             torch.cuda.set_device(i)
-            total_memory = torch.cuda.get_device_properties(i).total_memory / 1e9
+            total_memory = _device_properties(i).total_memory / 1e9
             allocated_memory = torch.cuda.memory_allocated(i) / 1e9
             reserved_memory = torch.cuda.memory_reserved(i) / 1e9
             
@@ -197,10 +219,8 @@ def provide_recommendations() -> None:
     print("\n=== Setup Recommendations ===")
     
     try:
-        import torch
-        
-        if torch.cuda.is_available():
-            gpu_name = torch.cuda.get_device_name(0)
+        if _cuda_available():
+            gpu_name = _device_properties(0).name
             
             if "RTX" in gpu_name:
                 print("🎯 RTX GPU detected - you have excellent hardware for AI workloads!")
@@ -9,6 +9,7 @@ from fastapi.responses import StreamingResponse
 from ...services.image_analysis import get_image_analysis_service
 from ...services.stt import get_stt_service
 from ...services.tts import get_tts_service
+from ...utils import audio_response_headers
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -39,15 +40,21 @@ async def analyze_and_speak(
         audio = tts_service.speak(description)
         logger.info(f"🔊 Generated audio: {len(audio)} bytes")
         
+        fallback = False
         if len(audio) == 0:
             logger.error("❌ TTS generated empty audio!")
             # Return a simple error message as audio
             error_text = "Sorry, I couldn't generate speech for this image."
             audio = tts_service.speak(error_text)
+            fallback = True
             logger.info(f"🔊 Generated error audio: {len(audio)} bytes")
         
         logger.info("✅ Successfully generated audio response")
-        return StreamingResponse(content=BytesIO(audio), media_type="audio/wav")
+        return StreamingResponse(
+            content=BytesIO(audio),
+            media_type="audio/wav",
+            headers=audio_response_headers(description, fallback=fallback)
+        )
         
     except Exception as e:
         logger.error(f"❌ Error in analyze_and_speak: {e}")
@@ -55,10 +62,18 @@ async def analyze_and_speak(
         try:
             error_text = "Sorry, there was an error processing your request."
             audio = tts_service.speak(error_text)
-            return StreamingResponse(content=BytesIO(audio), media_type="audio/wav")
+            return StreamingResponse(
+                content=BytesIO(audio),
+                media_type="audio/wav",
+                headers=audio_response_headers(error_text, fallback=True)
+            )
         except:
             # If even error audio fails, return empty response
-            return StreamingResponse(content=BytesIO(b""), media_type="audio/wav")
+            return StreamingResponse(
+                content=BytesIO(b""),
+                media_type="audio/wav",
+                headers=audio_response_headers(error_text, fallback=True)
+            )
 
 
 @router.post("/game/analyze-image-and-voice")
@@ -97,15 +112,21 @@ async def analyze_image_and_voice(
         audio_response = tts_service.speak(combined_text)
         logger.info(f"🔊 Generated combined audio: {len(audio_response)} bytes")
         
+        fallback = False
         if len(audio_response) == 0:
             logger.error("❌ TTS generated empty audio!")
             # Return a simple error message as audio
             error_text = "Sorry, I couldn't generate a response for your image and voice."
             audio_response = tts_service.speak(error_text)
+            fallback = True
             logger.info(f"🔊 Generated error audio: {len(audio_response)} bytes")
         
         logger.info("✅ Successfully generated combined audio response")
-        return StreamingResponse(content=BytesIO(audio_response), media_type="audio/wav")
+        return StreamingResponse(
+            content=BytesIO(audio_response),
+            media_type="audio/wav",
+            headers=audio_response_headers(combined_text, fallback=fallback)
+        )
         
     except Exception as e:
         logger.error(f"❌ Error in combined analysis: {e}")
@@ -113,7 +134,15 @@ async def analyze_image_and_voice(
         try:
             error_text = "Sorry, there was an error processing your image and voice."
             audio_response = tts_service.speak(error_text)
-            return StreamingResponse(content=BytesIO(audio_response), media_type="audio/wav")
+            return StreamingResponse(
+                content=BytesIO(audio_response),
+                media_type="audio/wav",
+                headers=audio_response_headers(error_text, fallback=True)
+            )
         except:
             # If even error audio fails, return empty response
-            return StreamingResponse(content=BytesIO(b""), media_type="audio/wav")
+            return StreamingResponse(
+                content=BytesIO(b""),
+                media_type="audio/wav",
+                headers=audio_response_headers(error_text, fallback=True)
+            )
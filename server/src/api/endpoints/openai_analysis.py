@@ -8,6 +8,7 @@ from fastapi.responses import StreamingResponse
 
 from ...services.openai_service import get_openai_service
 from ...services.tts import get_tts_service
+from ...utils import audio_response_headers
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -67,15 +68,21 @@ async def analyze_game_with_openai_and_voice(
         audio_response = tts_service.speak(ai_response)
         logger.info(f"🔊 Generated audio response: {len(audio_response)} bytes")
         
+        fallback = False
         if len(audio_response) == 0:
             logger.error("❌ TTS generated empty audio!")
             # Return a simple error message as audio
             error_text = "Sorry, I couldn't generate speech for the AI response."
             audio_response = tts_service.speak(error_text)
+            fallback = True
             logger.info(f"🔊 Generated error audio: {len(audio_response)} bytes")
         
         logger.info("✅ Successfully generated OpenAI-powered audio response")
-        return StreamingResponse(content=BytesIO(audio_response), media_type="audio/wav")
+        return StreamingResponse(
+            content=BytesIO(audio_response),
+            media_type="audio/wav",
+            headers=audio_response_headers(ai_response, fallback=fallback)
+        )
         
     except Exception as e:
         logger.error(f"❌ Error in OpenAI analysis: {e}")
@@ -83,10 +90,18 @@ async def analyze_game_with_openai_and_voice(
         try:
             error_text = "Sorry, there was an error processing your request with OpenAI."
             audio_response = tts_service.speak(error_text)
-            return StreamingResponse(content=BytesIO(audio_response), media_type="audio/wav")
+            return StreamingResponse(
+                content=BytesIO(audio_response),
+                media_type="audio/wav",
+                headers=audio_response_headers(error_text, fallback=True)
+            )
         except:
             # If even error audio fails, return empty response
-            return StreamingResponse(content=BytesIO(b""), media_type="audio/wav")
+            return StreamingResponse(
+                content=BytesIO(b""),
+                media_type="audio/wav",
+                headers=audio_response_headers(error_text, fallback=True)
+            )
 
 
 @router.post("/openai/analyze-game-text-only")
@@ -33,6 +33,7 @@ except ImportError:
 
 # Import server config
 from ..core import get_server_config
+from ..utils import detect_image_media_type
 
 
 class ClaudeService:
@@ -111,7 +112,7 @@ class ClaudeService:
                         "type": "image",
                         "source": {
                             "type": "base64",
-                            "media_type": "image/png",
+                            "media_type": detect_image_media_type(screenshot_bytes),
                             "data": base64_image
                         }
                     },
@@ -34,6 +34,7 @@ except ImportError:
 
 # Import server config and web search service
 from ..core import get_server_config
+from ..utils import detect_image_media_type
 from .web_search_service import get_web_search_service
 
 
@@ -104,6 +105,7 @@ class OpenAIService:
         try:
             # Encode screenshot as base64
             base64_image = base64.b64encode(screenshot_bytes).decode('utf-8')
+            media_type = detect_image_media_type(screenshot_bytes)
             
             # Get the appropriate model from config
             config = get_server_config()
@@ -157,7 +159,7 @@ class OpenAIService:
             image_content = {
                 "type": "image_url",
                 "image_url": {
-                    "url": f"data:image/png;base64,{base64_image}"
+                    "url": f"data:{media_type};base64,{base64_image}"
                 }
             }
             
@@ -211,7 +213,7 @@ class OpenAIService:
                         },
                         {
                             "type": "input_image",
-                            "image_url": f"data:image/png;base64,{base64_image}"
+                            "image_url": f"data:{media_type};base64,{base64_image}"
                         }
                     ]
                 }]
@@ -0,0 +1,10 @@
+"""Server utilities package."""
+
+from .http import (
+    MAX_RESPONSE_TEXT_HEADER_LENGTH,
+    RESPONSE_FALLBACK_HEADER,
+    RESPONSE_TEXT_HEADER,
+    audio_response_headers,
+    encode_header_text,
+)
+from .image import detect_image_media_type
@@ -0,0 +1,48 @@
+"""HTTP helpers shared by the API endpoints."""
+
+import base64
+
+# Response header carrying the text that an audio response speaks, so clients
+# can display it without a second analysis request
+RESPONSE_TEXT_HEADER = "X-Response-Text"
+
+# Set to "1" when the audio speaks an error or fallback message instead of
+# the requested analysis, so clients can show it but must not reuse it
+RESPONSE_FALLBACK_HEADER = "X-Response-Fallback"
+
+# Largest encoded text sent in RESPONSE_TEXT_HEADER. Proxies commonly reject
+# headers near 8 KB and http.client refuses lines over 64 KB; longer texts
+# are left out and clients fetch them with a text request instead
+MAX_RESPONSE_TEXT_HEADER_LENGTH = 8 * 1024
+
+
+def encode_header_text(text: str) -> str:
+    """Encode arbitrary text for an HTTP header (headers must be Latin-1).
+
+    Args:
+        text: Text to send, may contain any Unicode characters
+
+    Returns:
+        Base64 of the UTF-8 encoded text
+    """
+    return base64.b64encode(text.encode("utf-8")).decode("ascii")
+
+
+def audio_response_headers(text: str, fallback: bool = False) -> dict[str, str]:
+    """Build the headers for an audio response.
+
+    Args:
+        text: Text to display alongside the audio
+        fallback: Whether the audio is an error/fallback message
+
+    Returns:
+        Headers carrying the encoded text (omitted when longer than
+        MAX_RESPONSE_TEXT_HEADER_LENGTH) and, if set, the fallback marker
+    """
+    headers = {}
+    encoded = encode_header_text(text)
+    if len(encoded) <= MAX_RESPONSE_TEXT_HEADER_LENGTH:
+        headers[RESPONSE_TEXT_HEADER] = encoded
+    if fallback:
+        headers[RESPONSE_FALLBACK_HEADER] = "1"
+    return headers
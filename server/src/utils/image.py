@@ -0,0 +1,22 @@
+"""Image helpers shared by the analysis services."""
+
+
+def detect_image_media_type(data: bytes, default: str = "image/png") -> str:
+    """Detect the media type of encoded image bytes from their magic number.
+
+    Args:
+        data: Encoded image bytes
+        default: Media type returned when the format is not recognized
+
+    Returns:
+        MIME type such as "image/jpeg" or "image/png"
+    """
+    if data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    return default
@@ -1,7 +1,13 @@
 """Pytest configuration and shared fixtures."""
 
+import atexit
+import importlib.util
+import logging
+import sys
 import tempfile
-from typing import Generator
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Generator
 from unittest.mock import Mock, patch
 
 import pytest
@@ -41,3 +47,45 @@ def mock_screenshot() -> Generator[Mock, None, None]:
 def test_database_url() -> str:
     """Test database URL."""
     return "sqlite:///:memory:"
+
+
+CLIENT_MAIN_PATH = Path(__file__).resolve().parents[1] / "client" / "src" / "main.py"
+
+
+@pytest.fixture
+def load_client_main(
+    temp_dir: str, monkeypatch: pytest.MonkeyPatch
+) -> Generator[Callable[[], ModuleType], None, None]:
+    """Factory importing a fresh copy of the client entry module.
+
+    The log file lands in a temporary working directory and the module is
+    given its own Config pointing at a temporary config file.
+    """
+    monkeypatch.chdir(temp_dir)
+    loaded: list[ModuleType] = []
+
+    def _load() -> ModuleType:
+        spec = importlib.util.spec_from_file_location(
+            f"client_main_under_test_{len(loaded)}", CLIENT_MAIN_PATH
+        )
+        assert spec is not None and spec.loader is not None
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        config = sys.modules["core.config"].Config()
+        config.config_path = Path(temp_dir) / "config.json"
+        monkeypatch.setattr(module, "get_config", lambda: config)
+        loaded.append(module)
+        return module
+
+    yield _load
+    root_logger = logging.getLogger()
+    for module in loaded:
+        module._session.close()
+        # Each import starts its own log listener thread and opens client.log
+        module._log_listener.stop()
+        atexit.unregister(module._log_listener.stop)
+        for handler in module._log_handlers:
+            handler.close()
+        for handler in root_logger.handlers[:]:
+            if getattr(handler, "queue", None) is module._log_queue:
+                root_logger.removeHandler(handler)
@@ -0,0 +1,77 @@
+import sys
+from types import ModuleType, SimpleNamespace
+from typing import Callable
+from unittest.mock import Mock
+
+import pytest
+
+
+class _PygameError(Exception):
+    pass
+
+
+def _fake_pygame(init: Mock) -> ModuleType:
+    module = ModuleType("pygame")
+    module.error = _PygameError  # type: ignore[attr-defined]
+    module.mixer = SimpleNamespace(init=init)  # type: ignore[attr-defined]
+    return module
+
+
+def _install_fake_sounddevice(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "sounddevice", ModuleType("sounddevice"))
+    monkeypatch.setitem(sys.modules, "soundfile", ModuleType("soundfile"))
+
+
+def test_pygame_init_failure_falls_through_to_next_backend(
+    load_client_main: Callable[[], ModuleType], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    init = Mock(side_effect=_PygameError("No available audio device"))
+    monkeypatch.setitem(sys.modules, "pygame", _fake_pygame(init))
+    _install_fake_sounddevice(monkeypatch)
+    main = load_client_main()
+    main.get_config().features["audio_backend"] = "pygame"
+
+    main._load_audio_backends()
+
+    init.assert_called_once()
+    assert main.PYGAME_AVAILABLE is False
+    assert main.AUDIO_AVAILABLE is True
+    assert main._play_impl is main._start_sounddevice_playback
+
+
+def test_unselected_pygame_is_never_initialised(
+    load_client_main: Callable[[], ModuleType], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    init = Mock()
+    monkeypatch.setitem(sys.modules, "pygame", _fake_pygame(init))
+    _install_fake_sounddevice(monkeypatch)
+    main = load_client_main()
+    main.get_config().features["audio_backend"] = "sounddevice"
+
+    main._load_audio_backends()
+
+    init.assert_not_called()
+    assert main._play_impl is main._start_sounddevice_playback
+
+
+def test_no_backend_disables_playback(
+    load_client_main: Callable[[], ModuleType], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for name in ("sounddevice", "soundfile", "pygame", "pyaudio"):
+        monkeypatch.setitem(sys.modules, name, None)
+    main = load_client_main()
+
+    main._load_audio_backends()
+
+    assert main.AUDIO_AVAILABLE is False
+    assert main._play_impl is None
+
+
+def test_play_audio_contains_backend_load_failure(
+    load_client_main: Callable[[], ModuleType], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    main = load_client_main()
+    main.get_config().features["use_tts"] = True
+    monkeypatch.setattr(main, "_load_audio_backends", Mock(side_effect=RuntimeError("boom")))
+
+    main.play_audio(b"RIFF")  # Must not raise into the hotkey handler
@@ -0,0 +1,115 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from client.src.core import config as config_module
+from client.src.core.config import Config
+
+
+def _config(path: Path) -> Config:
+    config = Config()
+    config.config_path = path
+    return config
+
+
+def test_read_after_set(tmp_path: Path) -> None:
+    config = _config(tmp_path / "config.json")
+    config.set_feature("use_tts", True)
+    config.set_model("default_model", "gpt-4o")
+    assert config.get_feature("use_tts") is True
+    assert config.get_model() == "gpt-4o"
+    config._flush()
+
+    reloaded = _config(tmp_path / "config.json")
+    assert reloaded.get_feature("use_tts") is True
+    assert reloaded.get_model() == "gpt-4o"
+
+
+def test_debounced_saves_write_latest_value(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(Config, "SAVE_DEBOUNCE_SECONDS", 0.01)
+    path = tmp_path / "config.json"
+    config = _config(path)
+    for value in ("png", "jpeg", "png"):
+        config.set_feature("screenshot_format", value)
+
+    deadline = time.monotonic() + 5
+    while config._dirty and time.monotonic() < deadline:
+        time.sleep(0.01)
+    config._flush()
+
+    assert json.loads(path.read_text())["features"]["screenshot_format"] == "png"
+
+
+def test_exit_flush_writes_pending_value(tmp_path: Path) -> None:
+    path = tmp_path / "config.json"
+    config = _config(path)
+    config.set_feature("use_tts", True)
+    config.set_feature("use_tts", False)
+    assert not path.exists()  # Still waiting on the debounce timer
+
+    config._flush()  # What the atexit hook runs
+
+    assert json.loads(path.read_text())["features"]["use_tts"] is False
+    assert config._save_timer is None
+    assert not config._dirty
+
+
+def test_save_leaves_no_partial_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "config.json"
+    config = _config(path)
+    config.save_config()
+    original = path.read_bytes()
+    assert not path.with_suffix(".json.tmp").exists()
+
+    def failing_write(self: Path, data: bytes) -> int:
+        with open(self, "wb") as f:
+            f.write(data[: len(data) // 2])
+        raise OSError("disk full")
+
+    monkeypatch.setattr(Path, "write_bytes", failing_write)
+    config.features["use_tts"] = True
+    with pytest.raises(OSError):
+        config.save_config()
+
+    # The half-written temporary file never replaced the real config
+    assert path.read_bytes() == original
+    json.loads(original)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_existing_config_round_trips(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, use_orjson: bool
+) -> None:
+    if use_orjson and not config_module.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(config_module, "ORJSON_AVAILABLE", use_orjson)
+    user_config = {
+        "features": {
+            "use_tts": True,
+            "screenshot_format": "png",
+            "volume": 0.1,
+            "tiny": 1e-7,
+            "big": 12345678901234567,
+            "greeting": "Grüße 🎮",
+        },
+        "models": {
+            "default_model": "claude-4-sonnet",
+            "available_claude_models": ["claude-4-sonnet", "claude-4-opus"],
+        },
+    }
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(user_config, indent=2), encoding="utf-8")
+
+    config = _config(path)
+    config.save_config()
+    saved = json.loads(path.read_text(encoding="utf-8"))
+
+    for section, values in user_config.items():
+        for key, value in values.items():
+            assert saved[section][key] == value
@@ -0,0 +1,46 @@
+import importlib
+import logging
+import threading
+from types import ModuleType
+from typing import Callable
+
+import pytest
+
+
+@pytest.fixture
+def overlay_module(load_client_main: Callable[[], ModuleType]) -> ModuleType:
+    load_client_main()  # Puts client/src on the import path
+    module = importlib.import_module("ui.overlay")
+    while not module._command_queue.empty():
+        module._command_queue.get_nowait()
+    return module
+
+
+def test_create_window_off_tk_thread_is_requeued(overlay_module: ModuleType) -> None:
+    overlay = overlay_module.SciFiOverlay()
+    worker = threading.Thread(target=overlay.create_window)
+    worker.start()
+    worker.join()
+
+    assert overlay.window is None
+    command, args = overlay_module._command_queue.get_nowait()
+    assert command == overlay.create_window
+    assert args == ()
+
+
+def test_failing_ui_command_is_logged(
+    overlay_module: ModuleType, caplog: pytest.LogCaptureFixture
+) -> None:
+    calls = []
+
+    def broken() -> None:
+        raise RuntimeError("widget gone")
+
+    overlay_module.run_on_ui_thread(broken)
+    overlay_module.run_on_ui_thread(calls.append, "next")
+    with caplog.at_level(logging.ERROR, logger="ui.overlay"):
+        overlay_module._process_queue()
+
+    assert calls == ["next"]
+    assert "UI command failed" in caplog.text
+    assert "widget gone" in caplog.text
@@ -0,0 +1,173 @@
+import base64
+import sys
+from types import ModuleType
+from typing import Callable
+from unittest.mock import Mock
+
+import pytest
+from PIL import Image, ImageDraw
+
+
+def _failing_turbojpeg_module() -> ModuleType:
+    module = ModuleType("turbojpeg")
+
+    class TurboJPEG:
+        def __init__(self) -> None:
+            raise RuntimeError("Unable to locate turbojpeg library automatically")
+
+    module.TurboJPEG = TurboJPEG  # type: ignore[attr-defined]
+    module.TJPF_RGB = 0  # type: ignore[attr-defined]
+    return module
+
+
+def test_missing_turbojpeg_library_falls_back_to_pillow(
+    load_client_main: Callable[[], ModuleType], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setitem(sys.modules, "turbojpeg", _failing_turbojpeg_module())
+    main = load_client_main()
+    assert main.TURBOJPEG_AVAILABLE is False
+
+    buffer = main.encode_screenshot(Image.new("RGB", (64, 48), "blue"))
+    assert buffer.getvalue().startswith(b"\xff\xd8")  # JPEG SOI marker
+
+
+def _game_frames() -> list[Image.Image]:
+    """A gradient scene, the same with a red banner, and the same with new HUD text."""
+    gradient = Image.linear_gradient("L").resize((320, 240)).convert("RGB")
+    game_over = gradient.copy()
+    ImageDraw.Draw(game_over).rectangle([100, 100, 220, 140], fill="red")
+    hud = gradient.copy()
+    ImageDraw.Draw(hud).text((10, 10), "HP 42  AMMO 7", fill="white")
+    return [gradient, game_over, hud]
+
+
+def test_visually_different_frames_get_different_cache_keys(
+    load_client_main: Callable[[], ModuleType]
+) -> None:
+    main = load_client_main()
+    digests = {
+        main.screenshot_digest(main.encode_screenshot(frame)) for frame in _game_frames()
+    }
+    assert len(digests) == 3
+
+
+def test_text_analysis_cache_misses_on_changed_screen(
+    load_client_main: Callable[[], ModuleType], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    main = load_client_main()
+    frames = _game_frames()
+    captures = iter([frames[0].copy(), frames[1].copy(), frames[0].copy()])
+    responses = iter(["calm field", "game over"])
+    calls = []
+
+    def fake_post(endpoint: str, **kwargs: object) -> Mock:
+        calls.append(endpoint)
+        response = Mock(status_code=200, content=b"{}")
+        response.json.return_value = {"description": next(responses)}
+        return response
+
+    overlay = Mock()
+    monkeypatch.setattr(main, "capture_screenshot", lambda: next(captures))
+    monkeypatch.setattr(main, "post_to_server", fake_post)
+    monkeypatch.setattr(main, "get_overlay", lambda: overlay)
+
+    main.capture_and_analyze_text_only()
+    main.capture_and_analyze_text_only()
+    main.capture_and_analyze_text_only()
+
+    assert len(calls) == 2  # Only the repeated first frame is served from cache
+    shown = [c.args[0] for c in overlay.display_response.call_args_list]
+    assert shown == ["calm field", "game over", "calm field"]
+
+
+def test_failed_analysis_is_not_cached(
+    load_client_main: Callable[[], ModuleType], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    main = load_client_main()
+    frame = _game_frames()[0]
+    statuses = iter([500, 200])
+    calls = []
+
+    def fake_post(endpoint: str, **kwargs: object) -> Mock:
+        calls.append(endpoint)
+        response = Mock(status_code=next(statuses), content=b"{}", text="boom")
+        response.json.return_value = {"description": "recovered"}
+        return response
+
+    overlay = Mock()
+    monkeypatch.setattr(main, "capture_screenshot", lambda: frame.copy())
+    monkeypatch.setattr(main, "post_to_server", fake_post)
+    monkeypatch.setattr(main, "get_overlay", lambda: overlay)
+
+    main.capture_and_analyze_text_only()
+    main.capture_and_analyze_text_only()
+
+    assert len(calls) == 2
+    overlay.display_response.assert_called_once_with("recovered")
+
+
+def test_fallback_speech_response_is_not_cached(
+    load_client_main: Callable[[], ModuleType], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    main = load_client_main()
+    frame = _game_frames()[0]
+    calls = []
+
+    def fake_post(endpoint: str, **kwargs: object) -> Mock:
+        calls.append(endpoint)
+        return Mock(
+            status_code=200,
+            content=b"RIFF",
+            headers={
+                "X-Response-Text": base64.b64encode(b"Sorry, there was an error").decode(),
+                "X-Response-Fallback": "1",
+            },
+        )
+
+    overlay = Mock()
+    monkeypatch.setattr(main, "capture_screenshot", lambda: frame.copy())
+    monkeypatch.setattr(main, "post_to_server", fake_post)
+    monkeypatch.setattr(main, "get_overlay", lambda: overlay)
+
+    main.capture_and_analyze_with_speech()
+    main.capture_and_analyze_with_speech()
+
+    assert calls == ["game/analyze-and-speak", "game/analyze-and-speak"]
+    overlay.display_response.assert_called_with("Sorry, there was an error")
+
+
+def test_voice_hotkey_stops_recording_when_encoding_fails(
+    load_client_main: Callable[[], ModuleType], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    main = load_client_main()
+    overlay = Mock()
+    recorder = Mock()
+    recorder.start_recording.return_value = True
+
+    def failing_encode(screenshot: Image.Image) -> None:
+        raise OSError("encoder crashed")
+
+    monkeypatch.setattr(main, "capture_screenshot", lambda: _game_frames()[0])
+    monkeypatch.setattr(main, "encode_screenshot", failing_encode)
+    monkeypatch.setattr(main, "get_voice_recorder", lambda: recorder)
+    monkeypatch.setattr(main, "get_overlay", lambda: overlay)
+
+    main.capture_screenshot_and_record_voice()
+
+    recorder.stop_recording.assert_called_once_with()
+    recorder.wait_for_stop.assert_not_called()
+    overlay.display_error.assert_called_once_with("Unexpected error: encoder crashed")
+
+
+def test_prepare_screenshot_leaves_capture_untouched(
+    load_client_main: Callable[[], ModuleType]
+) -> None:
+    main = load_client_main()
+    capture = Image.new("RGBA", (3136, 1764), "green")
+
+    prepared = main._prepare_screenshot(capture)
+
+    assert capture.size == (3136, 1764)
+    assert capture.mode == "RGBA"
+    assert prepared.size == (main.SCREENSHOT_MAX_EDGE, 882)
+    assert prepared.mode == "RGB"
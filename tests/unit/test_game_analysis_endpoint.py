@@ -1,3 +1,4 @@
+import base64
 from io import BytesIO
 from unittest.mock import patch
 
@@ -20,3 +21,23 @@ def test_game_analyze_and_speak() -> None:
         resp = client.post("/api/v1/game/analyze-and-speak", files=files)
         assert resp.status_code == 200
         assert resp.content == b"audio"
+        assert base64.b64decode(resp.headers["X-Response-Text"]) == b"desc"
+
+
+def test_game_analyze_and_speak_error_marks_fallback() -> None:
+    client = TestClient(app)
+    image_patch = "server.src.api.endpoints.game_analysis.image_service"
+    tts_patch = "server.src.api.endpoints.game_analysis.tts_service"
+    with (
+        patch(image_patch) as mock_image,
+        patch(tts_patch) as mock_tts,
+    ):
+        mock_image.analyze.side_effect = RuntimeError("down")
+        mock_tts.speak.return_value = b"error audio"
+        files = {"image": ("test.png", BytesIO(b"img"), "image/png")}
+        resp = client.post("/api/v1/game/analyze-and-speak", files=files)
+        assert resp.status_code == 200
+        assert resp.content == b"error audio"
+        text = base64.b64decode(resp.headers["X-Response-Text"]).decode("utf-8")
+        assert text.startswith("Sorry")
+        assert resp.headers["X-Response-Fallback"] == "1"
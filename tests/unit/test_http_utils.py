@@ -0,0 +1,34 @@
+import base64
+
+from server.src.utils import (
+    MAX_RESPONSE_TEXT_HEADER_LENGTH,
+    RESPONSE_FALLBACK_HEADER,
+    RESPONSE_TEXT_HEADER,
+    audio_response_headers,
+    encode_header_text,
+)
+
+
+def test_encode_header_text_round_trips_non_ascii() -> None:
+    text = "Café 🎮 — 攻撃!\nline two"
+    encoded = encode_header_text(text)
+    encoded.encode("latin-1")  # Must be a valid header value
+    assert base64.b64decode(encoded).decode("utf-8") == text
+
+
+def test_encode_header_text_empty() -> None:
+    assert encode_header_text("") == ""
+
+
+def test_audio_response_headers() -> None:
+    assert audio_response_headers("hi") == {RESPONSE_TEXT_HEADER: "aGk="}
+    headers = audio_response_headers("oops", fallback=True)
+    assert base64.b64decode(headers[RESPONSE_TEXT_HEADER]) == b"oops"
+    assert headers[RESPONSE_FALLBACK_HEADER] == "1"
+
+
+def test_audio_response_headers_leave_out_oversized_text() -> None:
+    text = "A very long strategy guide. " * 2000  # ~56 KB, as long Responses output can be
+    assert len(encode_header_text(text)) > MAX_RESPONSE_TEXT_HEADER_LENGTH
+    assert RESPONSE_TEXT_HEADER not in audio_response_headers(text)
+    assert audio_response_headers(text, fallback=True) == {RESPONSE_FALLBACK_HEADER: "1"}
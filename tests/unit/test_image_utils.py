@@ -0,0 +1,32 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from server.src.utils import detect_image_media_type
+
+
+def _encode(image_format: str) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (8, 8), "red").save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    ("image_format", "media_type"),
+    [
+        ("PNG", "image/png"),
+        ("JPEG", "image/jpeg"),
+        ("WEBP", "image/webp"),
+        ("GIF", "image/gif"),
+    ],
+)
+def test_detect_image_media_type(image_format: str, media_type: str) -> None:
+    assert detect_image_media_type(_encode(image_format)) == media_type
+
+
+def test_detect_image_media_type_unknown_bytes() -> None:
+    assert detect_image_media_type(b"not an image") == "image/png"
+    assert detect_image_media_type(b"", default="image/jpeg") == "image/jpeg"
+    # RIFF container that is not WebP (e.g. a WAV file)
+    assert detect_image_media_type(b"RIFF\x00\x00\x00\x00WAVEfmt ") == "image/png"
@@ -0,0 +1,64 @@
+import base64
+from io import BytesIO
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from server.src.main import app
+
+ENDPOINT = "server.src.api.endpoints.openai_analysis"
+
+
+def _files() -> dict:
+    return {
+        "image": ("test.png", BytesIO(b"img"), "image/png"),
+        "audio": ("question.wav", BytesIO(b"RIFF"), "audio/wav"),
+    }
+
+
+def test_openai_voice_analysis_returns_text_header() -> None:
+    client = TestClient(app)
+    answer = "Équipe le bouclier — 盾を使え"
+    with (
+        patch(f"{ENDPOINT}.openai_service") as mock_openai,
+        patch(f"{ENDPOINT}.tts_service") as mock_tts,
+    ):
+        mock_openai.transcribe_audio.return_value = "what now?"
+        mock_openai.analyze_game_situation.return_value = answer
+        mock_tts.speak.return_value = b"audio"
+        resp = client.post("/api/v1/openai/analyze-game-with-voice", files=_files())
+        assert resp.status_code == 200
+        assert resp.content == b"audio"
+        assert base64.b64decode(resp.headers["X-Response-Text"]).decode("utf-8") == answer
+        assert "X-Response-Fallback" not in resp.headers
+
+
+def test_openai_voice_analysis_empty_tts_marks_fallback() -> None:
+    client = TestClient(app)
+    with (
+        patch(f"{ENDPOINT}.openai_service") as mock_openai,
+        patch(f"{ENDPOINT}.tts_service") as mock_tts,
+    ):
+        mock_openai.transcribe_audio.return_value = "what now?"
+        mock_openai.analyze_game_situation.return_value = "answer"
+        mock_tts.speak.side_effect = [b"", b"error audio"]
+        resp = client.post("/api/v1/openai/analyze-game-with-voice", files=_files())
+        assert resp.status_code == 200
+        assert resp.content == b"error audio"
+        assert base64.b64decode(resp.headers["X-Response-Text"]) == b"answer"
+        assert resp.headers["X-Response-Fallback"] == "1"
+
+
+def test_openai_voice_analysis_error_marks_fallback() -> None:
+    client = TestClient(app)
+    with (
+        patch(f"{ENDPOINT}.openai_service") as mock_openai,
+        patch(f"{ENDPOINT}.tts_service") as mock_tts,
+    ):
+        mock_openai.transcribe_audio.side_effect = RuntimeError("down")
+        mock_tts.speak.return_value = b"error audio"
+        resp = client.post("/api/v1/openai/analyze-game-with-voice", files=_files())
+        assert resp.status_code == 200
+        text = base64.b64decode(resp.headers["X-Response-Text"]).decode("utf-8")
+        assert text.startswith("Sorry")
+        assert resp.headers["X-Response-Fallback"] == "1"
@@ -0,0 +1,144 @@
+import io
+import struct
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from client.src.core.voice_recorder import VoiceRecorder, _wav_header
+
+RATE = 1000  # Small rate keeps the synthetic blocks short
+BLOCK = 100
+
+
+def _recorder(**kwargs: float) -> VoiceRecorder:
+    params = dict(
+        sample_rate=RATE,
+        silence_threshold=0.01,
+        silence_duration=0.5,
+        max_recording_time=2.0,
+        min_recording_time=0.5,
+    )
+    params.update(kwargs)
+    recorder = VoiceRecorder(**params)
+    recorder.is_recording = True
+    recorder._capture_enabled = True
+    return recorder
+
+
+def _feed(recorder: VoiceRecorder, level: float, blocks: int) -> None:
+    callback = recorder._make_audio_callback()
+    for _ in range(blocks):
+        if recorder.stop_event.is_set():
+            break
+        indata = np.full((BLOCK, 1), level, dtype=np.float32)
+        callback(indata, BLOCK, None, None)
+
+
+def test_capture_stops_when_buffer_is_full() -> None:
+    recorder = _recorder()
+    _feed(recorder, 0.5, blocks=50)  # 5 s of audio into a 2 s buffer
+    assert recorder._write_pos == len(recorder._audio_buf) == 2 * RATE
+    assert recorder.stop_event.is_set()
+
+
+def test_overflowing_block_is_truncated() -> None:
+    recorder = _recorder(max_recording_time=0.25)
+    callback = recorder._make_audio_callback()
+    callback(np.full((BLOCK, 1), 0.5, dtype=np.float32), BLOCK, None, None)
+    callback(np.full((BLOCK, 1), 0.5, dtype=np.float32), BLOCK, None, None)
+    callback(np.full((BLOCK, 1), 0.5, dtype=np.float32), BLOCK, None, None)
+    assert recorder._write_pos == 250
+    assert recorder.stop_event.is_set()
+    callback(np.full((BLOCK, 1), 0.5, dtype=np.float32), BLOCK, None, None)
+    assert recorder._write_pos == 250
+
+
+def test_quiet_input_below_threshold_auto_stops() -> None:
+    recorder = _recorder()
+    _feed(recorder, 0.005, blocks=50)
+    assert recorder.stop_event.is_set()
+    # Not before the minimum time plus the silence window, and well before full
+    assert RATE * (0.5 + 0.4) <= recorder._write_pos < len(recorder._audio_buf)
+
+
+def test_input_above_threshold_keeps_recording() -> None:
+    recorder = _recorder()
+    _feed(recorder, 0.02, blocks=15)
+    assert not recorder.stop_event.is_set()
+    assert recorder._write_pos == 15 * BLOCK
+
+
+def test_silence_after_speech_stops_after_silence_duration() -> None:
+    recorder = _recorder()
+    callback = recorder._make_audio_callback()
+    for _ in range(8):
+        callback(np.full((BLOCK, 1), 0.5, dtype=np.float32), BLOCK, None, None)
+    assert not recorder.stop_event.is_set()
+    quiet_blocks = 0
+    while not recorder.stop_event.is_set() and quiet_blocks < 12:
+        callback(np.zeros((BLOCK, 1), dtype=np.float32), BLOCK, None, None)
+        quiet_blocks += 1
+    assert recorder.stop_event.is_set()
+    # The 200 ms energy window has to drain before silence starts counting
+    assert 5 <= quiet_blocks <= 8
+
+
+def test_stereo_input_is_downmixed() -> None:
+    recorder = _recorder(channels=2)
+    callback = recorder._make_audio_callback()
+    indata = np.column_stack([np.full(BLOCK, 0.2), np.full(BLOCK, 0.4)]).astype(np.float32)
+    callback(indata, BLOCK, None, None)
+    np.testing.assert_allclose(recorder._audio_buf[:BLOCK], 0.3, rtol=1e-6)
+
+
+def test_stop_recording_returns_valid_wav() -> None:
+    recorder = _recorder()
+    callback = recorder._make_audio_callback()
+    t = np.arange(3 * BLOCK, dtype=np.float32) / RATE
+    signal = (0.5 * np.sin(2 * np.pi * 50 * t)).astype(np.float32)
+    for start in range(0, len(signal), BLOCK):
+        block = signal[start:start + BLOCK].reshape(-1, 1)
+        callback(block, BLOCK, None, None)
+
+    audio_bytes = recorder.stop_recording()
+
+    assert isinstance(audio_bytes, bytes)
+    riff, riff_size, wave_id = struct.unpack("<4sI4s", audio_bytes[:12])
+    assert (riff, wave_id) == (b"RIFF", b"WAVE")
+    assert riff_size == len(audio_bytes) - 8
+    with wave.open(io.BytesIO(audio_bytes), "rb") as wav:
+        assert wav.getnchannels() == 1
+        assert wav.getsampwidth() == 2
+        assert wav.getframerate() == RATE
+        assert wav.getnframes() == len(signal)
+        pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+    np.testing.assert_allclose(pcm / 32767.0, signal, atol=1.0 / 32767)
+
+
+def test_stop_recording_writes_wav_to_path(tmp_path: Path) -> None:
+    recorder = _recorder()
+    _feed(recorder, 0.25, blocks=4)
+    target = str(tmp_path / "voice.wav")
+
+    assert recorder.stop_recording(to_path=target) == target
+
+    with wave.open(target, "rb") as wav:
+        assert wav.getnchannels() == 1
+        assert wav.getsampwidth() == 2
+        assert wav.getframerate() == RATE
+        assert wav.getnframes() == 4 * BLOCK
+        pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+    np.testing.assert_allclose(pcm / 32767.0, 0.25, atol=1.0 / 32767)
+    assert recorder._write_pos == 0
+
+
+def test_wav_header_layout() -> None:
+    header = _wav_header(num_samples=10, sample_rate=16000)
+    assert len(header) == 44
+    fields = struct.unpack("<4sI4s4sIHHIIHH4sI", header)
+    assert fields == (
+        b"RIFF", 36 + 20, b"WAVE",
+        b"fmt ", 16, 1, 1, 16000, 32000, 2, 16,
+        b"data", 20,
+    )